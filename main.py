@@ -9,7 +9,7 @@ import logging
 import asyncio
 import json  # Import json for parsing API keys
 from datetime import datetime
-from flask import Flask, render_template, request, jsonify, send_file, send_from_directory, session, has_request_context
+from flask import Flask, Response, render_template, request, jsonify, send_file, send_from_directory, session, has_request_context
 from flask_socketio import SocketIO, emit, join_room, leave_room
 from werkzeug.utils import secure_filename
 
@@ -36,9 +36,29 @@ app.config[
     'MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB limit for file uploads
 
 # Initialize SocketIO
+try:
+    import orjson
+
+    class _OrjsonWrapper:
+        """json-module shim so Socket.IO serializes frames with orjson (C
+        extension) instead of the stdlib encoder"""
+
+        @staticmethod
+        def dumps(obj, **kwargs):
+            return orjson.dumps(obj).decode()
+
+        @staticmethod
+        def loads(s, **kwargs):
+            return orjson.loads(s)
+
+    _socketio_json = _OrjsonWrapper
+except ImportError:
+    _socketio_json = json
+
 socketio = SocketIO(app,
                     cors_allowed_origins="*",
                     async_mode='threading',
+                    json=_socketio_json,
                     logger=False,
                     engineio_logger=False)
 
@@ -102,6 +122,7 @@ def initialize_services(api_keys):
 
         websocket_service = WebSocketService(llm_service=llm_service,
                                              tts_service=tts_service)
+        websocket_service.socketio = socketio
         logger.info("Services initialized successfully.")
 
     except Exception as e:
@@ -113,6 +134,7 @@ def initialize_services(api_keys):
             llm_service = LLMService(gemini_api_key=None)
             websocket_service = WebSocketService(llm_service=llm_service,
                                                  tts_service=tts_service)
+            websocket_service.socketio = socketio
             logger.info("Services initialized with fallback configuration.")
         except Exception as fallback_error:
             logger.error(
@@ -351,6 +373,25 @@ def serve_audio_file(filename):
         return jsonify({'error': 'Failed to serve audio file'}), 500
 
 
+@app.route('/tts/stream/<job_id>')
+def stream_tts_audio(job_id):
+    """Proxy Murf audio to the client as a chunked stream"""
+    try:
+        service = tts_service or TTSService(app=app)
+        stream = service.open_stream_job(job_id)
+
+        if stream is None:
+            return jsonify({'error': 'Unknown or expired stream job'}), 404
+
+        response = Response(stream, mimetype='audio/mpeg')
+        response.headers['Access-Control-Allow-Origin'] = '*'
+        return response
+
+    except Exception as e:
+        logger.error(f"Error streaming TTS audio: {str(e)}")
+        return jsonify({'error': 'Failed to stream audio'}), 500
+
+
 @app.route('/agent/chat/<session_id>', methods=['POST'])
 def agent_chat(session_id):
     """Enhanced chat endpoint with complete pipeline"""
@@ -1,38 +1,157 @@
 import os
+import re
+import json
+import time
+import asyncio
+import inspect
 import logging
+import shutil
 import hashlib
+import socket
+import threading
+import queue
 import uuid
-from typing import Dict, Any, Optional
-from gtts import gTTS
-try:
-    from murf import Murf
-except ImportError:
-    Murf = None
+from collections import OrderedDict
+from types import MappingProxyType
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Any, Final, Optional
+import requests
 from flask import url_for
 from datetime import datetime
 import io
 
 logger = logging.getLogger(__name__)
 
+# Audio cache limits - cached files are content-addressed so identical
+# (text, voice, persona) requests never re-hit the TTS providers
+CACHE_MAX_ENTRIES = 1024
+CACHE_MAX_BYTES = int(os.environ.get('TTS_CACHE_MAX_BYTES', 256 * 1024 * 1024))
+CACHE_INDEX_FLUSH_EVERY = 16
+
+# Sentence boundaries used to split long replies for parallel synthesis
+_SENTENCE_RE = re.compile(r'(?<=[.!?])\s+')
+
+_PERSONA_CONFIG = {
+    'pirate': {
+        'voice_id': 'en-US-davis',
+        'pitch_adjustment': -15,
+        'speed_adjustment': -10,
+        'style': 'gruff',
+        'announce_change': "Arrr! Switching to me pirate voice now, matey!",
+        'sound_effects': ['ocean_waves', 'ship_creaking']
+    },
+    'default': {
+        'voice_id': 'en-US-sarah',
+        'pitch_adjustment': 0,
+        'speed_adjustment': 0,
+        'style': 'friendly',
+        'announce_change': "Switching back to my default voice.",
+        'sound_effects': []
+    }
+}
+
+# Frozen persona -> voice lookup; unknown personas keep the caller's voice_id
+_PERSONA_TO_VOICE = MappingProxyType(
+    {persona: cfg['voice_id'] for persona, cfg in _PERSONA_CONFIG.items()})
+
+# Precompiled pirate text effects: one pass for punctuation pauses, one for
+# emphasizing the pirate vocabulary, instead of a chain of str.replace calls
+_PIRATE_WORDS = ('arrr', 'matey', 'ahoy', 'ye', 'treasure', 'ship', 'sea', 'captain')
+_PIRATE_RE = re.compile(r'\b(' + '|'.join(_PIRATE_WORDS) + r')\b', re.IGNORECASE)
+_PUNCT_RE = re.compile(r'[.,]')
+
+MURF_GENERATE_URL = "https://api.murf.ai/v1/speech/generate"
+
+# Last-resort audio returned when even gTTS fails: a short silent WAV clip
+_FALLBACK_DATA_URL: Final[str] = "data:audio/wav;base64,UklGRnoGAABXQVZFZm10IBAAAAABAAEAQB8AAEAfAAABAAgAZGF0YQoGAACBhYqFbF1fdJivrJBhNjVgodDbq2EcBj+a2/LDciUFLIHO8tiJNwgZaLvt559NEAxQp+PwtmMcBjiR1/LMeSwFJHfH8N2QQAoUXrTp66hVFApGn+DyvmcfCjuO0y7RgTEGHW/A7+OZUSI="
+
+# Pending stream jobs (job_id -> (remote audio URL, created_at)), shared
+# across TTSService instances because main.py constructs per-request
+# instances. Bounded: clients that never fetch their stream URL would
+# otherwise leak one entry per Murf generation for the process lifetime.
+_STREAM_JOBS = {}
+_STREAM_JOBS_LOCK = threading.Lock()
+_STREAM_JOBS_MAX = 256
+_STREAM_JOB_TTL = 600
+_STREAM_CHUNK_SIZE = 4096
+
+# In-memory LRU over the on-disk audio cache, shared across TTSService
+# instances for the same reason as _STREAM_JOBS - per-instance state would
+# start empty on every REST request and the cache would never hit
+_CACHE_LOCK = threading.Lock()
+_CACHE = OrderedDict()
+_cache_bytes = 0
+_cache_writes = 0
+_cache_index_loaded = False
+
+# Warm the Murf connection once per process, not once per instance -
+# per-request instances would otherwise spawn a thread and issue an extra
+# DNS lookup plus HTTPS HEAD on every REST call
+_WARMUP_STARTED = threading.Event()
+
+# Process-wide Murf concurrency cap and singleflight map. Module level for
+# the same reason as _CACHE: per-instance copies on per-request instances
+# would never bound concurrency or dedup across requests.
+_MURF_SEM = threading.BoundedSemaphore(
+    int(os.environ.get('MURF_MAX_CONCURRENCY', '6')))
+_INFLIGHT = {}
+_INFLIGHT_LOCK = threading.Lock()
+
+# Render buffers larger than this are not returned to the pool, so one huge
+# reply can't pin a big allocation forever
+_BUF_POOL_MAX_BUFFER = 1024 * 1024
+
 class TTSService:
+    # Lazily imported heavyweight backends, cached on the class so only the
+    # first call pays the import cost (and startup pays none of it)
+    _gTTS = None
+    _Murf = None
+
+    @classmethod
+    def _import_gtts(cls):
+        if cls._gTTS is None:
+            from gtts import gTTS
+            cls._gTTS = gTTS
+        return cls._gTTS
+
+    @classmethod
+    def _import_murf(cls):
+        if cls._Murf is None:
+            try:
+                from murf import Murf
+            except ImportError:
+                cls._Murf = False
+            else:
+                cls._Murf = Murf
+        return cls._Murf or None
+
     def __init__(self, app=None, api_key=None):
         from flask import current_app
 
         self.app = app or current_app
         self.api_key = api_key or os.environ.get('MURF_API_KEY')
 
-        if self.api_key and Murf:
-            try:
-                self.murf_client = Murf(api_key=self.api_key)
-            except Exception as e:
-                logger.warning(f"Failed to initialize Murf client: {e}")
-                self.murf_client = None
-        else:
-            self.murf_client = None
-            if not Murf:
-                logger.warning("Murf package not available")
+        # Pooled HTTP session shared by the direct Murf calls and the audio
+        # cache downloads - reuses TLS connections instead of one per call
+        self._http = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=20, pool_maxsize=20)
+        self._http.mount('https://', adapter)
+        self._http.mount('http://', adapter)
+
+        self.murf_client = None
+        if self.api_key:
+            Murf = self._import_murf()
+            if Murf:
+                try:
+                    self.murf_client = Murf(api_key=self.api_key)
+                except Exception as e:
+                    logger.warning(f"Failed to initialize Murf client: {e}")
             else:
-                logger.warning("Murf API key not configured")
+                logger.warning("Murf package not available")
+        else:
+            logger.warning("Murf API key not configured")
+
+        self._murf_supports_modulation = self._probe_murf_capabilities()
 
         if self.app:
             try:
@@ -45,6 +164,35 @@ class TTSService:
             self.audio_dir = os.path.join(os.getcwd(), 'static', 'audio')
             os.makedirs(self.audio_dir, exist_ok=True)
 
+        # Precompute the serve_audio_file URL once so call sites can build
+        # audio URLs with a str.replace instead of entering an app context
+        # and running Flask's URL map on every request
+        self._audio_url_template = None
+        try:
+            with self.app.app_context():
+                self._audio_url_template = url_for(
+                    'serve_audio_file', filename='__FILENAME__', _external=True, _scheme='https')
+        except Exception as e:
+            logger.debug(f"Could not precompute audio URL template: {e}")
+
+        # Bounded pool for parallel per-sentence synthesis; the semaphore caps
+        # in-flight provider calls so bursts don't trip Murf's rate limits
+        self._executor = ThreadPoolExecutor(max_workers=4)
+        self._segment_sem = threading.BoundedSemaphore(3)
+
+        # Reusable render buffers so concurrent gTTS calls don't churn the
+        # allocator with a fresh multi-kB BytesIO per request
+        self._buf_pool = queue.LifoQueue(maxsize=32)
+
+        # Audio cache index lives next to the audio files; the cache itself
+        # is module level (_CACHE) and the index is loaded once per process
+        self._cache_index_path = os.path.join(self.audio_dir, 'tts_cache_index.json')
+        self._load_cache_index()
+
+        if self.api_key and not _WARMUP_STARTED.is_set():
+            _WARMUP_STARTED.set()
+            threading.Thread(target=self._warmup, daemon=True).start()
+
         self.persona_voices = {
             'default': {
                 'voice': 'en-US-AriaNeural',
@@ -65,6 +213,145 @@ class TTSService:
     def is_murf_configured(self) -> bool:
         return bool(self.murf_client)
 
+    def _probe_murf_capabilities(self) -> bool:
+        """Check once whether the installed Murf SDK accepts voice modulation
+        parameters, instead of rediscovering failures on every request"""
+        if not self.murf_client:
+            return False
+        try:
+            params = inspect.signature(self.murf_client.text_to_speech.generate).parameters
+        except (TypeError, ValueError):
+            return False
+        return 'pitch' in params or any(
+            p.kind == inspect.Parameter.VAR_KEYWORD for p in params.values())
+
+    def _warmup(self):
+        """Resolve DNS and establish the TLS connection to Murf in the
+        background so the first real request hits a warm connection"""
+        try:
+            socket.getaddrinfo('api.murf.ai', 443)
+            self._http.head('https://api.murf.ai/', timeout=5)
+            logger.info("Murf connection warmed up")
+        except Exception as e:
+            logger.debug(f"Murf warmup request failed: {e}")
+
+    def _audio_url(self, filename: str) -> str:
+        if self._audio_url_template:
+            return self._audio_url_template.replace('__FILENAME__', filename)
+        with self.app.app_context():
+            return url_for('serve_audio_file', filename=filename, _external=True, _scheme='https')
+
+    def _cache_key(self, text: str, voice_id: str, persona: str) -> str:
+        return hashlib.sha256(f"{text}|{voice_id}|{persona}".encode()).hexdigest()
+
+    def _load_cache_index(self):
+        global _cache_bytes, _cache_index_loaded
+        with _CACHE_LOCK:
+            if _cache_index_loaded:
+                return
+            _cache_index_loaded = True
+            try:
+                with open(self._cache_index_path) as f:
+                    entries = json.load(f)
+                for key, entry in entries.items():
+                    path = os.path.join(self.audio_dir, entry['filename'])
+                    if os.path.exists(path):
+                        entry.setdefault('size', os.path.getsize(path))
+                        _CACHE[key] = entry
+                        _cache_bytes += entry['size']
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logger.warning(f"Could not load TTS cache index: {e}")
+
+    def _save_cache_index(self):
+        try:
+            with open(self._cache_index_path, 'w') as f:
+                json.dump(dict(_CACHE), f)
+        except Exception as e:
+            logger.warning(f"Could not persist TTS cache index: {e}")
+
+    def _cache_get(self, key: str) -> Optional[Dict[str, Any]]:
+        global _cache_bytes
+        with _CACHE_LOCK:
+            entry = _CACHE.get(key)
+            if not entry:
+                return None
+            if not os.path.exists(os.path.join(self.audio_dir, entry['filename'])):
+                _cache_bytes -= entry.get('size', 0)
+                del _CACHE[key]
+                return None
+            _CACHE.move_to_end(key)
+            return entry
+
+    def _cache_put(self, key: str, filename: str, voice_used: str):
+        global _cache_bytes, _cache_writes
+        path = os.path.join(self.audio_dir, filename)
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return
+
+        with _CACHE_LOCK:
+            old = _CACHE.pop(key, None)
+            if old:
+                _cache_bytes -= old.get('size', 0)
+            _CACHE[key] = {
+                'filename': filename,
+                'created_at': datetime.now().isoformat(),
+                'voice_used': voice_used,
+                'size': size
+            }
+            _cache_bytes += size
+
+            while _CACHE and (len(_CACHE) > CACHE_MAX_ENTRIES
+                              or _cache_bytes > CACHE_MAX_BYTES):
+                _, evicted = _CACHE.popitem(last=False)
+                _cache_bytes -= evicted.get('size', 0)
+                try:
+                    os.remove(os.path.join(self.audio_dir, evicted['filename']))
+                except OSError:
+                    pass
+
+            _cache_writes += 1
+            if _cache_writes % CACHE_INDEX_FLUSH_EVERY == 0:
+                self._save_cache_index()
+
+    def _cached_audio_response(self, entry: Dict[str, Any], text: str, persona: str) -> Dict[str, Any]:
+        audio_url = self._audio_url(entry['filename'])
+
+        return {
+            'success': True,
+            'audio_url': audio_url,
+            'voice_used': entry.get('voice_used', ''),
+            'service_used': 'cache',
+            'character_count': len(text),
+            'filename': entry['filename'],
+            'persona': persona,
+            'cache_hit': True
+        }
+
+    def _cache_remote_audio(self, key: str, audio_url: str, voice_used: str):
+        """Download Murf's CDN audio once so repeat requests serve the local
+        copy. Runs on the executor, off the response path - the uncached
+        request returns the CDN URL immediately, as it did before caching"""
+        try:
+            filename = f"tts-{key[:16]}.mp3"
+            path = os.path.join(self.audio_dir, filename)
+
+            with self._http.get(audio_url, stream=True, timeout=30) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                with open(path, 'wb') as f:
+                    # 1MB copy buffer - a whole MP3 typically lands in one or
+                    # two writes instead of dozens of 8KB default-size chunks
+                    shutil.copyfileobj(response.raw, f, length=1024 * 1024)
+
+            self._cache_put(key, filename, voice_used)
+
+        except Exception as e:
+            logger.warning(f"Could not cache Murf audio locally: {e}")
+
     def generate_speech(self, text: str, voice_id: str = "en-US-natalie", persona: str = "default") -> Dict[str, Any]:
         if not text or not text.strip():
             return {
@@ -74,46 +361,77 @@ class TTSService:
 
         text = text.strip()
 
-        persona_config = {
-            'pirate': {
-                'voice_id': 'en-US-davis',
-                'pitch_adjustment': -15,
-                'speed_adjustment': -10,
-                'style': 'gruff',
-                'announce_change': "Arrr! Switching to me pirate voice now, matey!",
-                'sound_effects': ['ocean_waves', 'ship_creaking']
-            },
-            'default': {
-                'voice_id': 'en-US-sarah',
-                'pitch_adjustment': 0,
-                'speed_adjustment': 0,
-                'style': 'friendly',
-                'announce_change': "Switching back to my default voice.",
-                'sound_effects': []
-            }
-        }
-
-        config = persona_config.get(persona, persona_config['default'])
-        voice_id = config['voice_id']
+        config = _PERSONA_CONFIG.get(persona, _PERSONA_CONFIG['default'])
+        voice_id = _PERSONA_TO_VOICE.get(persona, voice_id)
 
         if persona != 'default':
-            logger.info(f"🎭 PERSONA VOICE CHANGE: {config['announce_change']}")
-            print(f"🎭 {config['announce_change']}")
+            logger.info("🎭 PERSONA VOICE CHANGE: %s", config['announce_change'])
 
-        logger.info(f"Using voice '{voice_id}' for persona '{persona}' with adjustments: pitch={config['pitch_adjustment']}%, speed={config['speed_adjustment']}%")
+        logger.info("Using voice '%s' for persona '%s' with adjustments: pitch=%d%%, speed=%d%%",
+                    voice_id, persona, config['pitch_adjustment'], config['speed_adjustment'])
 
-        if self.is_murf_configured():
-            murf_result = self._generate_murf_speech_with_persona(text, voice_id, config)
-            if murf_result['success']:
-                return murf_result
+        cache_key = self._cache_key(text, voice_id, persona)
+        cached = self._cache_get(cache_key)
+        if cached:
+            logger.info("TTS cache hit for persona '%s': %s", persona, cached['filename'])
+            return self._cached_audio_response(cached, text, persona)
 
-            logger.warning("Murf TTS failed, falling back to gTTS")
+        # Singleflight: concurrent identical requests share one provider
+        # call instead of each paying for (and billing) their own
+        with _INFLIGHT_LOCK:
+            existing = _INFLIGHT.get(cache_key)
+            if existing is None:
+                future = Future()
+                _INFLIGHT[cache_key] = future
 
-        return self._generate_gtts_speech_with_persona(text, persona, config)
+        if existing is not None:
+            logger.info(f"Joining in-flight TTS generation for persona '{persona}'")
+            return existing.result()
+
+        try:
+            result = self._generate_uncached(text, voice_id, persona, config, cache_key)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with _INFLIGHT_LOCK:
+                _INFLIGHT.pop(cache_key, None)
+
+    def _generate_uncached(self, text: str, voice_id: str, persona: str,
+                           config: Dict[str, Any], cache_key: str) -> Dict[str, Any]:
+        if self.is_murf_configured():
+            # Cap simultaneous Murf calls; excess load sheds to the local
+            # gTTS fallback instead of stacking behind the rate limit
+            if not _MURF_SEM.acquire(timeout=2.0):
+                logger.warning("Murf concurrency limit reached, shedding to gTTS")
+            else:
+                try:
+                    murf_result = self._generate_murf_speech_with_persona(text, voice_id, config)
+                finally:
+                    _MURF_SEM.release()
+
+                if murf_result['success']:
+                    stream_url = self._register_stream_url(murf_result['audio_url'], cache_key)
+                    if stream_url:
+                        murf_result['stream_url'] = stream_url
+                    self._executor.submit(self._cache_remote_audio, cache_key,
+                                          murf_result['audio_url'],
+                                          murf_result.get('voice_used', ''))
+                    return murf_result
+
+                logger.warning("Murf TTS failed, falling back to gTTS")
+
+        gtts_result = self._generate_gtts_speech_with_persona(text, persona, config)
+        if gtts_result['success'] and gtts_result.get('filename'):
+            self._cache_put(cache_key, gtts_result['filename'], gtts_result.get('voice_used', ''))
+        return gtts_result
 
     def _generate_murf_speech_with_persona(self, text: str, voice_id: str, config: Dict[str, Any]) -> Dict[str, Any]:
         try:
-            logger.info(f"Generating Murf speech with persona: {len(text)} characters")
+            text_len = len(text)
+            logger.info("Generating Murf speech with persona: %d characters", text_len)
 
             base_pitch = 1.0
             base_speed = 1.0
@@ -121,7 +439,8 @@ class TTSService:
             pitch_multiplier = base_pitch + (config['pitch_adjustment'] / 100.0)
             speed_multiplier = base_speed + (config['speed_adjustment'] / 100.0)
 
-            logger.info(f"Applying voice modulation - Pitch: {pitch_multiplier:.2f}, Speed: {speed_multiplier:.2f}")
+            logger.info("Applying voice modulation - Pitch: %.2f, Speed: %.2f",
+                        pitch_multiplier, speed_multiplier)
 
             murf_params = {
                 'text': text,
@@ -130,20 +449,26 @@ class TTSService:
                 'sample_rate': 44100.0
             }
 
-            try:
+            if self._murf_supports_modulation:
                 murf_params['pitch'] = pitch_multiplier
                 murf_params['speed'] = speed_multiplier
                 murf_params['style'] = config.get('style', 'default')
-            except:
+            else:
                 logger.warning("Voice modulation parameters not supported by current Murf version")
 
-            response = self.murf_client.text_to_speech.generate(**murf_params)
-
             audio_url = None
-            if hasattr(response, 'audio_file'):
-                audio_url = response.audio_file
-            elif isinstance(response, dict):
-                audio_url = response.get('audio_file') or response.get('url')
+            try:
+                audio_url = self._murf_generate_http(murf_params)
+            except Exception as e:
+                logger.warning(f"Direct Murf HTTP call failed, falling back to SDK: {e}")
+
+            if not audio_url:
+                response = self.murf_client.text_to_speech.generate(**murf_params)
+
+                if hasattr(response, 'audio_file'):
+                    audio_url = response.audio_file
+                elif isinstance(response, dict):
+                    audio_url = response.get('audio_file') or response.get('url')
 
             if not audio_url:
                 logger.error("No audio URL in Murf response")
@@ -159,7 +484,7 @@ class TTSService:
                 'audio_url': audio_url,
                 'voice_used': voice_id,
                 'service_used': 'murf_persona',
-                'character_count': len(text),
+                'character_count': text_len,
                 'persona_config': config,
                 'voice_modulation': {
                     'pitch': pitch_multiplier,
@@ -175,38 +500,137 @@ class TTSService:
                 'error': f'Murf TTS with persona error: {str(e)}'
             }
 
+    def _register_stream_url(self, audio_url: str, cache_key: str) -> Optional[str]:
+        """Register a stream job for Murf's CDN audio and return the local
+        proxy URL, so clients get first bytes before the full download"""
+        job_id = uuid.uuid4().hex
+        now = time.monotonic()
+        with _STREAM_JOBS_LOCK:
+            # Sweep expired jobs, then evict oldest insertions past the cap
+            expired = [jid for jid, (_, _, created) in _STREAM_JOBS.items()
+                       if now - created > _STREAM_JOB_TTL]
+            for jid in expired:
+                del _STREAM_JOBS[jid]
+            while len(_STREAM_JOBS) >= _STREAM_JOBS_MAX:
+                del _STREAM_JOBS[next(iter(_STREAM_JOBS))]
+            _STREAM_JOBS[job_id] = (audio_url, cache_key, now)
+
+        try:
+            with self.app.app_context():
+                return url_for('stream_tts_audio', job_id=job_id, _external=True, _scheme='https')
+        except Exception as e:
+            logger.debug(f"Stream endpoint not available: {e}")
+            with _STREAM_JOBS_LOCK:
+                _STREAM_JOBS.pop(job_id, None)
+            return None
+
+    def open_stream_job(self, job_id: str):
+        """Return a chunk generator for a registered stream job, or None"""
+        with _STREAM_JOBS_LOCK:
+            job = _STREAM_JOBS.pop(job_id, None)
+        if job is None:
+            return None
+        audio_url, cache_key, created = job
+        if time.monotonic() - created > _STREAM_JOB_TTL:
+            return None
+
+        # The background cache download may have landed by now; serve the
+        # local copy instead of pulling the same bytes from the CDN again
+        entry = self._cache_get(cache_key)
+        if entry:
+            return self._iter_local_audio(os.path.join(self.audio_dir, entry['filename']))
+        return self._iter_remote_audio(audio_url)
+
+    def _iter_local_audio(self, path: str):
+        with open(path, 'rb') as f:
+            while True:
+                chunk = f.read(_STREAM_CHUNK_SIZE)
+                if not chunk:
+                    return
+                yield chunk
+
+    def _iter_remote_audio(self, audio_url: str):
+        with self._http.get(audio_url, stream=True, timeout=30) as response:
+            response.raise_for_status()
+            for chunk in response.iter_content(chunk_size=_STREAM_CHUNK_SIZE):
+                if chunk:
+                    yield chunk
+
+    def _murf_generate_http(self, murf_params: Dict[str, Any]) -> Optional[str]:
+        """Issue the Murf generate call over the pooled session, bypassing the SDK"""
+        payload = {
+            'text': murf_params['text'],
+            'voiceId': murf_params['voice_id'],
+            'format': murf_params.get('format', 'MP3'),
+            'sampleRate': murf_params.get('sample_rate', 44100.0)
+        }
+        if 'pitch' in murf_params:
+            payload['pitch'] = murf_params['pitch']
+        if 'speed' in murf_params:
+            payload['speed'] = murf_params['speed']
+        if 'style' in murf_params:
+            payload['style'] = murf_params['style']
+
+        response = self._http.post(MURF_GENERATE_URL,
+                                   json=payload,
+                                   headers={'api-key': self.api_key},
+                                   timeout=30)
+        response.raise_for_status()
+        data = response.json()
+        return data.get('audioFile') or data.get('audio_file') or data.get('url')
+
     def _generate_gtts_speech_with_persona(self, text: str, persona: str, config: Dict[str, Any]) -> Dict[str, Any]:
         try:
-            logger.info(f"Generating gTTS speech with persona '{persona}': {len(text)} characters")
+            text_len = len(text)
+            logger.info("Generating gTTS speech with persona '%s': %d characters", persona, text_len)
 
-            text_hash = hashlib.md5(text.encode()).hexdigest()
-            filename = f"gtts-{persona}-{text_hash[:8]}-{uuid.uuid4().hex[:8]}.mp3"
+            # 64-bit digest: the filename is the sole content address (no
+            # random suffix), so it must make collisions between distinct
+            # texts negligible - files persist on disk and in the cache index
+            text_hash = hashlib.blake2b(text.encode(), digest_size=8).hexdigest()
+            filename = f"gtts-{persona}-{text_hash}.mp3"
 
             modified_text = self._apply_persona_text_effects(text, persona, config)
 
             slow_speech = config['speed_adjustment'] < -5
+            gTTS = self._import_gtts()
             tts = gTTS(text=modified_text, lang='en', slow=slow_speech)
 
-            static_dir = os.path.join(self.app.instance_path, 'static', 'audio')
-            os.makedirs(static_dir, exist_ok=True)
+            audio_path = os.path.join(self.audio_dir, filename)
 
-            audio_path = os.path.join(static_dir, filename)
-            tts.save(audio_path)
+            # Render into memory first, then write the whole MP3 in one shot -
+            # tts.save() would issue one small write() per fetched fragment
+            try:
+                buf = self._buf_pool.get_nowait()
+                buf.seek(0)
+                buf.truncate()
+            except queue.Empty:
+                buf = io.BytesIO()
+
+            tts.write_to_fp(buf)
+            audio_bytes = buf.getvalue()
+            with open(audio_path, 'wb') as f:
+                f.write(audio_bytes)
+
+            if len(audio_bytes) <= _BUF_POOL_MAX_BUFFER:
+                try:
+                    self._buf_pool.put_nowait(buf)
+                except queue.Full:
+                    pass
 
             processed_audio_path = self._apply_voice_effects(audio_path, config)
 
-            with self.app.app_context():
-                final_filename = os.path.basename(processed_audio_path) if processed_audio_path else filename
-                audio_url = url_for('serve_audio_file', filename=final_filename, _external=True, _scheme='https')
+            final_filename = os.path.basename(processed_audio_path) if processed_audio_path else filename
+            audio_url = self._audio_url(final_filename)
 
-            logger.info(f"gTTS speech with persona '{persona}' generated successfully")
+            logger.info("gTTS speech with persona '%s' generated successfully", persona)
 
             return {
                 'success': True,
                 'audio_url': audio_url,
                 'voice_used': f'gTTS-{persona}-enhanced',
                 'service_used': 'gtts_persona',
-                'character_count': len(text),
+                'character_count': text_len,
                 'filename': final_filename if processed_audio_path else filename,
                 'persona': persona,
                 'persona_config': config,
@@ -222,18 +646,47 @@ class TTSService:
                 'error': f'gTTS with persona error: {str(e)}'
             }
 
-    def _apply_persona_text_effects(self, text: str, persona: str, config: Dict[str, Any]) -> str:
-        if persona == 'pirate':
-            modified_text = text
-            modified_text = modified_text.replace('.', '... ')
-            modified_text = modified_text.replace(',', ', pause, ')
+    async def generate_speech_async(self, text: str, voice_id: str = "en-US-natalie", persona: str = "default") -> Dict[str, Any]:
+        """Async entry point for event-loop callers (the WebSocket services
+        run on asyncio) - offloads the blocking provider calls to a worker
+        thread so concurrent TTS requests don't stall the loop"""
+        return await asyncio.to_thread(self.generate_speech, text, voice_id, persona)
 
-            pirate_words = ['arrr', 'matey', 'ahoy', 'ye', 'treasure', 'ship', 'sea', 'captain']
-            for word in pirate_words:
-                modified_text = modified_text.replace(word, f'{word.upper()}')
-                modified_text = modified_text.replace(word.capitalize(), f'{word.upper()}')
+    def generate_speech_streaming(self, text: str, voice_id: str = "en-US-natalie", persona: str = "default"):
+        """Split text at sentence boundaries and synthesize segments in parallel.
 
-            return modified_text
+        Yields per-segment result dicts in order, so the caller can start
+        playing the first sentence while the rest are still generating.
+        """
+        if not text or not text.strip():
+            yield {
+                'success': False,
+                'error': 'No text provided for speech generation'
+            }
+            return
+
+        segments = [s for s in _SENTENCE_RE.split(text.strip()) if s.strip()]
+
+        def synthesize(segment):
+            with self._segment_sem:
+                return self.generate_speech(segment, voice_id, persona)
+
+        futures = [self._executor.submit(synthesize, segment) for segment in segments]
+        for index, future in enumerate(futures):
+            result = future.result()
+            result['segment_index'] = index
+            result['segment_count'] = len(segments)
+            yield result
+
+    def _generate_gtts_speech(self, text: str) -> Dict[str, Any]:
+        """Plain gTTS generation - thin wrapper over the persona-aware path"""
+        return self._generate_gtts_speech_with_persona(text, 'default', _PERSONA_CONFIG['default'])
+
+    def _apply_persona_text_effects(self, text: str, persona: str, config: Dict[str, Any]) -> str:
+        if persona == 'pirate':
+            modified_text = _PUNCT_RE.sub(
+                lambda m: '... ' if m.group(0) == '.' else ', pause, ', text)
+            return _PIRATE_RE.sub(lambda m: m.group(0).upper(), modified_text)
 
         return text
 
@@ -248,8 +701,7 @@ class TTSService:
                 effects.append(f"style: {config['style']}")
 
             if effects:
-                logger.info(f"Voice effects to apply: {', '.join(effects)}")
-                print(f"🎵 Voice effects simulated: {', '.join(effects)}")
+                logger.info("Voice effects to apply: %s", ', '.join(effects))
 
             return None
 
@@ -268,4 +720,4 @@ class TTSService:
         except Exception as e:
             logger.error(f"Fallback audio generation failed: {str(e)}")
 
-        return "data:audio/wav;base64,UklGRnoGAABXQVZFZm10IBAAAAABAAEAQB8AAEAfAAABAAgAZGF0YQoGAACBhYqFbF1fdJivrJBhNjVgodDbq2EcBj+a2/LDciUFLIHO8tiJNwgZaLvt559NEAxQp+PwtmMcBjiR1/LMeSwFJHfH8N2QQAoUXrTp66hVFApGn+DyvmcfCjuO0y7RgTEGHW/A7+OZUSI="
\ No newline at end of file
+        return _FALLBACK_DATA_URL
\ No newline at end of file
@@ -3,14 +3,147 @@ Enhanced Weather Service with OpenWeatherMap API
 Provides comprehensive weather data including current conditions, forecasts, and alerts
 """
 import os
+import re
+import json
+import time
+import asyncio
+import functools
 import logging
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+try:
+    import httpx
+except ImportError:
+    httpx = None
+try:
+    import redis
+except ImportError:
+    redis = None
+try:
+    import orjson
+except ImportError:
+    orjson = None
 from typing import Dict, Any, Optional, List
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 
 logger = logging.getLogger(__name__)
 
+def _parse(response):
+    """Decode a JSON response body; orjson (C extension) when installed,
+    stdlib json otherwise"""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+@functools.lru_cache(maxsize=256)
+def _render_analysis(persona, full_location, temp, feels_like, humidity, description):
+    """Render the spoken weather summary; memoized since conversations often
+    repeat the same persona/city/conditions combination ("repeat that")"""
+    if persona == 'pirate':
+        return f"Arrr! The weather at {full_location} be {description} with a temperature of {temp}°C (feels like {feels_like}°C), humidity at {humidity}%. The winds be tellin' tales of the sea, matey!"
+    return f"The weather in {full_location} is {description} with a temperature of {temp}°C (feels like {feels_like}°C) and humidity at {humidity}%."
+
+def _error_snippet(response) -> str:
+    """First few hundred bytes of an error body for logging.
+
+    Reads a single bounded chunk instead of decoding the full payload via
+    response.text; falls back to .text for clients without iter_content.
+    """
+    try:
+        chunk = next(response.iter_content(chunk_size=512), b'')
+        return chunk.decode('utf-8', errors='replace')[:200]
+    except (AttributeError, TypeError):
+        return response.text[:200]
+
+# Weather data goes stale on the order of minutes; coordinates barely change
+CACHE_TTL_CURRENT = 300
+CACHE_TTL_FORECAST = 900
+CACHE_TTL_COORDS = 1800
+_LOCAL_CACHE_MAX_ENTRIES = 512
+
+# Circuit breaker: after this many consecutive auth/server errors, skip the
+# round-trip entirely for the cooldown window
+_BREAKER_THRESHOLD = 5
+_BREAKER_COOLDOWN = 30.0
+
+# City-name normalization data, built once instead of per lookup
+_CITY_CORRECTIONS = {
+    'New Yourk': 'New York',
+    'Dellhi': 'Delhi,India',
+    'Mumbay': 'Mumbai,India',
+    'Bangalor': 'Bangalore,India',
+    'Chenai': 'Chennai,India',
+    'Japur': 'Jaipur,India',
+    'Calcuta': 'Kolkata,India',
+    'Hydrabad': 'Hyderabad,India',
+    'Poon': 'Pune,India',
+    'Ahmadabad': 'Ahmedabad,India'
+}
+
+# Indian cities default to ",India" when no country is given
+_INDIAN_CITIES = frozenset({
+    'delhi', 'mumbai', 'bangalore', 'kolkata', 'chennai', 'hyderabad',
+    'pune', 'ahmedabad', 'jaipur', 'lucknow', 'kanpur', 'nagpur', 'indore',
+    'bhopal', 'visakhapatnam', 'patna', 'vadodara', 'ghaziabad', 'ludhiana',
+    'agra'
+})
+
+# Filler words that shouldn't be part of the city sent upstream
+_UNWANTED_RE = re.compile(r'\b(?:weather|temperature|forecast|city|and)\b', re.IGNORECASE)
+
+# Canonical "<city> <country>" forms, keyed by the sorted lowercase words of
+# the input so "India Delhi" and "delhi india" hit the same entry in one
+# dict lookup instead of a chain of substring scans
+_CANONICAL = {
+    'delhi india': 'Delhi,India',
+    'india mumbai': 'Mumbai,India',
+    'bangalore india': 'Bangalore,India',
+    'chennai india': 'Chennai,India',
+    'india kolkata': 'Kolkata,India',
+    'hyderabad india': 'Hyderabad,India',
+    'india pune': 'Pune,India'
+}
+
+# Persona-specific report skeletons, rendered with .format/.format_map so
+# the formatter is one template lookup instead of if/else chains per section
+_RESPONSE_TEMPLATES = {
+    'pirate': {
+        'header': "Ahoy! Here be the weather report for {city}",
+        'state': ", {state}",
+        'country': " in {country}",
+        'header_end': "!\n\n",
+        'current': ("🌡️ Current conditions: {temperature}°C, feelin' like {feels_like}°C\n"
+                    "☁️ Sky conditions: {description}\n"
+                    "💨 Wind blowin' at {wind_speed} kph\n"
+                    "💧 Humidity: {humidity}%\n\n"),
+        'footer': "Stay safe on the seas, matey! ⚓"
+    },
+    'default': {
+        'header': "Weather Report for {city}",
+        'state': ", {state}",
+        'country': ", {country}",
+        'header_end': "\n\n",
+        'current': ("🌡️ Current: {temperature}°C (feels like {feels_like}°C)\n"
+                    "☁️ Conditions: {description}\n"
+                    "💨 Wind: {wind_speed} kph\n"
+                    "💧 Humidity: {humidity}%\n"
+                    "👁️ Visibility: {visibility} km\n\n"),
+        'footer': "Stay safe and prepared! 🌟"
+    }
+}
+
 class WeatherService:
+    # Fixed attribute layout: no per-instance __dict__, smaller footprint and
+    # faster attribute access when instantiated per request
+    __slots__ = (
+        'weather_api_key', 'openweather_api_key', 'api_key',
+        '_has_openweather', '_configured', 'base_url', 'service_type',
+        'geo_url', '_session', '_client', '_redis', '_local_cache',
+        '_cache_hits', '_cache_misses', '_breaker', '_geo_cache'
+    )
+
     def __init__(self, api_key: str = None):
         """Initialize weather service with API key"""
         # Support both WeatherAPI.com and OpenWeatherMap
@@ -20,20 +153,164 @@ class WeatherService:
         # Prefer WeatherAPI.com as it's more reliable
         self.api_key = self.weather_api_key or self.openweather_api_key
 
-        # Set base URL based on which API key is available
+        # Cached configuration flags, consulted on every request
+        self._has_openweather = bool(self.openweather_api_key)
+        self._configured = bool(self.api_key)
+
+        # Set base URL based on which API key is available; https so TLS
+        # session resumption kicks in across pooled requests
         if self.weather_api_key:
-            self.base_url = "http://api.weatherapi.com/v1"
+            self.base_url = "https://api.weatherapi.com/v1"
             self.service_type = "weatherapi"
         elif self.openweather_api_key:
-            self.base_url = "http://api.openweathermap.org/data/2.5"
+            self.base_url = "https://api.openweathermap.org/data/2.5"
             self.service_type = "openweather"
         else:
             self.base_url = None
             self.service_type = None
 
+        self.geo_url = "https://api.openweathermap.org/geo/1.0"
+
+        # Pooled session shared by every upstream call - avoids a fresh
+        # DNS/TCP/TLS handshake per request and retries transient 5xx errors
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=Retry(total=2, backoff_factor=0.2,
+                              status_forcelist=[500, 502, 503, 504]))
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
+        # Compressed JSON bodies roughly halve bytes on the wire
+        self._session.headers.update({'Accept': 'application/json',
+                                      'Accept-Encoding': 'gzip'})
+
+        # Prefer HTTP/2 when httpx is installed so back-to-back lookups
+        # multiplex on one connection; the requests session stays as fallback
+        self._client = None
+        if httpx is not None:
+            client_kwargs = dict(
+                timeout=10.0,
+                headers={'Accept': 'application/json', 'Accept-Encoding': 'gzip'},
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10))
+            try:
+                self._client = httpx.Client(http2=True, **client_kwargs)
+            except ImportError:
+                # h2 extra not installed - HTTP/1.1 httpx client still pools
+                self._client = httpx.Client(**client_kwargs)
+
+        # Cache-aside layer: Redis when REDIS_URL is set and the client is
+        # installed, otherwise a small in-process TTL dict
+        self._redis = None
+        if redis is not None and os.environ.get('REDIS_URL'):
+            try:
+                self._redis = redis.Redis.from_url(os.environ['REDIS_URL'], decode_responses=True)
+            except Exception as e:
+                logger.warning(f"Redis cache unavailable, using in-process cache: {e}")
+        self._local_cache = {}
+        self._cache_hits = 0
+        self._cache_misses = 0
+
+        # Circuit breaker state for the WeatherAPI.com upstream
+        self._breaker = {'fail_count': 0, 'opened_at': 0.0}
+
+        # Warm geocoding results never expire - coordinates don't move
+        self._geo_cache = {}
+
+    def _cached(self, key: str, ttl: int, fn):
+        """Cache-aside wrapper for JSON-serializable lookup results"""
+        try:
+            if self._redis is not None:
+                hit = self._redis.get(key)
+                if hit is not None:
+                    self._cache_hits += 1
+                    return json.loads(hit)
+            else:
+                entry = self._local_cache.get(key)
+                if entry and entry[1] > time.monotonic():
+                    self._cache_hits += 1
+                    return entry[0]
+        except Exception as e:
+            logger.debug(f"Cache read failed for {key}: {e}")
+
+        self._cache_misses += 1
+        value = fn()
+
+        # Don't pin failures for the success TTL: error dicts (timeouts,
+        # bad keys, breaker-open short-circuits) would otherwise keep being
+        # served for minutes after the condition clears. The None negative
+        # result for coordinates has no 'success' key and still caches.
+        if isinstance(value, dict) and value.get('success') is False:
+            return value
+
+        try:
+            if self._redis is not None:
+                self._redis.setex(key, ttl, json.dumps(value))
+            else:
+                if len(self._local_cache) >= _LOCAL_CACHE_MAX_ENTRIES:
+                    now = time.monotonic()
+                    self._local_cache = {k: v for k, v in self._local_cache.items()
+                                         if v[1] > now}
+                    # Purge may free nothing when every entry is live;
+                    # drop the oldest insertions so the bound holds
+                    while len(self._local_cache) >= _LOCAL_CACHE_MAX_ENTRIES:
+                        del self._local_cache[next(iter(self._local_cache))]
+                self._local_cache[key] = (value, time.monotonic() + ttl)
+        except Exception as e:
+            logger.debug(f"Cache write failed for {key}: {e}")
+        return value
+
+    def _breaker_is_open(self) -> bool:
+        """True while the WeatherAPI breaker is tripped and cooling down"""
+        return (self._breaker['fail_count'] >= _BREAKER_THRESHOLD and
+                time.monotonic() - self._breaker['opened_at'] < _BREAKER_COOLDOWN)
+
+    def _breaker_record(self, status_code: int):
+        """Track consecutive upstream failures; 401/403/5xx trip the breaker"""
+        if status_code == 401 or status_code == 403 or status_code >= 500:
+            self._breaker['fail_count'] += 1
+            # Re-arm on every failure at or past the threshold so a
+            # sustained outage keeps the breaker cycling open after each
+            # cooldown probe instead of tripping only once
+            if self._breaker['fail_count'] >= _BREAKER_THRESHOLD:
+                self._breaker['opened_at'] = time.monotonic()
+                logger.warning(f"🌤️ WeatherAPI circuit breaker opened for {_BREAKER_COOLDOWN}s")
+        else:
+            self._breaker['fail_count'] = 0
+
+    _BREAKER_ERROR = {
+        'success': False,
+        'error': 'WeatherAPI.com temporarily unavailable (circuit breaker open)',
+        'current_conditions': {},
+        'forecast': []
+    }
+
+    def _get(self, url, params=None, timeout=10):
+        """GET via the HTTP/2 client when available, else the pooled session.
+
+        Both return objects with the same .status_code/.json()/.text surface.
+        """
+        if self._client is not None:
+            return self._client.get(url, params=params)
+        return self._session.get(url, params=params, timeout=timeout)
+
+    def close(self):
+        """Release pooled connections"""
+        if self._client is not None:
+            self._client.close()
+        self._session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
     def get_comprehensive_weather_analysis(self, city: str, date_context: str = None) -> Dict[str, Any]:
         """Get comprehensive weather analysis for a city"""
         try:
+            # Normalize once here; internal helpers receive the cleaned value
+            city = self._clean_city_name(city)
             if not self.api_key:
                 return {
                     'success': False,
@@ -67,22 +344,24 @@ class WeatherService:
     def _get_weather_from_weatherapi(self, city: str) -> Dict[str, Any]:
         """Get weather from WeatherAPI.com"""
         try:
-            # Clean and validate city name
-            clean_city = self._clean_city_name(city)
-            
+            if self._breaker_is_open():
+                return dict(self._BREAKER_ERROR)
+
+            # City arrives pre-cleaned from the public entry points
             current_url = f"{self.base_url}/current.json"
             params = {
                 'key': self.weather_api_key,
-                'q': clean_city,
+                'q': city,
                 'aqi': 'no'
             }
 
-            logger.info(f"🌤️ WeatherAPI request for city: '{clean_city}' (original: '{city}')")
-            response = requests.get(current_url, params=params, timeout=10)
+            logger.info(f"🌤️ WeatherAPI request for city: '{city}'")
+            response = self._get(current_url, params=params)
             logger.info(f"🌤️ WeatherAPI response status: {response.status_code}")
+            self._breaker_record(response.status_code)
 
             if response.status_code == 200:
-                data = response.json()
+                data = _parse(response)
                 actual_city = data['location']['name']
                 actual_region = data['location']['region']
                 actual_country = data['location']['country']
@@ -109,7 +388,7 @@ class WeatherService:
             else:
                 error_msg = f'WeatherAPI.com error: {response.status_code}'
                 if response.status_code == 400:
-                    error_msg += f' - City "{clean_city}" not found. Please check the city name spelling.'
+                    error_msg += f' - City "{city}" not found. Please check the city name spelling.'
                 elif response.status_code == 401:
                     error_msg += ' - Invalid API key'
                 elif response.status_code == 403:
@@ -138,13 +417,14 @@ class WeatherService:
             params = {
                 'q': city,
                 'appid': self.openweather_api_key,
-                'units': 'metric'
+                'units': 'metric',
+                'lang': 'en'
             }
 
-            response = requests.get(current_url, params=params, timeout=10)
+            response = self._get(current_url, params=params)
 
             if response.status_code == 200:
-                data = response.json()
+                data = _parse(response)
                 return {
                     'success': True,
                     'current_conditions': {
@@ -184,51 +464,27 @@ class WeatherService:
         # Remove extra whitespace and normalize
         city = city.strip()
         
-        # Handle specific country/state requests
+        # Handle specific country/state requests via one O(1) dict lookup
+        # over the word-order-normalized form
         city_lower = city.lower()
-        if 'delhi' in city_lower and 'india' in city_lower:
-            return "Delhi,India"
-        elif 'mumbai' in city_lower and 'india' in city_lower:
-            return "Mumbai,India"
-        elif 'bangalore' in city_lower and 'india' in city_lower:
-            return "Bangalore,India"
-        
-        # Handle common misspellings and variations
-        city_corrections = {
-            'New Yourk': 'New York',
-            'Dellhi': 'Delhi,India',
-            'Mumbay': 'Mumbai,India',
-            'Bangalor': 'Bangalore,India',
-            'Chenai': 'Chennai,India',
-            'Japur': 'Jaipur,India',
-            'Calcuta': 'Kolkata,India',
-            'Hydrabad': 'Hyderabad,India',
-            'Poon': 'Pune,India',
-            'Ahmadabad': 'Ahmedabad,India'
-        }
-        
-        # Check for corrections first
-        city_title = city.title()
-        if city_title in city_corrections:
-            city = city_corrections[city_title]
-            logger.info(f"🌤️ Corrected city name to: {city}")
-            return city
-        
+        canonical = _CANONICAL.get(' '.join(sorted(city_lower.replace(',', ' ').split())))
+        if canonical:
+            return canonical
+
+
+        # Check for misspelling corrections first
+        corrected = _CITY_CORRECTIONS.get(city.title())
+        if corrected:
+            logger.info(f"🌤️ Corrected city name to: {corrected}")
+            return corrected
+
         # For Indian cities, default to India if no country specified
-        indian_cities = ['delhi', 'mumbai', 'bangalore', 'kolkata', 'chennai', 'hyderabad', 'pune', 'ahmedabad', 'jaipur', 'lucknow', 'kanpur', 'nagpur', 'indore', 'bhopal', 'visakhapatnam', 'patna', 'vadodara', 'ghaziabad', 'ludhiana', 'agra']
-        
-        if city_lower in indian_cities and 'india' not in city_lower:
+        if city_lower in _INDIAN_CITIES:
             return f"{city.title()},India"
-        
-        # Remove common words that shouldn't be part of city name
-        unwanted_words = ['weather', 'temperature', 'forecast', 'city', 'and']
-        words = city.split()
-        cleaned_words = []
-        
-        for word in words:
-            if word.lower() not in unwanted_words:
-                cleaned_words.append(word)
-        
+
+        # Strip filler words in a single regex pass
+        cleaned_words = _UNWANTED_RE.sub('', city).split()
+
         return ','.join(cleaned_words) if ',' in city else ' '.join(cleaned_words)
 
     def format_weather_analysis_response(self, weather_data: Dict[str, Any], persona: str = None) -> str:
@@ -256,21 +512,38 @@ class WeatherService:
             location_parts.append(country)
         full_location = ', '.join(location_parts)
 
-        if persona == 'pirate':
-            return f"Arrr! The weather at {full_location} be {description} with a temperature of {temp}°C (feels like {feels_like}°C), humidity at {humidity}%. The winds be tellin' tales of the sea, matey!"
-        else:
-            return f"The weather in {full_location} is {description} with a temperature of {temp}°C (feels like {feels_like}°C) and humidity at {humidity}%."
+        return _render_analysis(persona, full_location, temp, feels_like,
+                                humidity, description)
 
     def is_configured(self) -> bool:
         """Check if the service is properly configured"""
-        return bool(self.api_key)
+        return self._configured
 
     def set_api_key(self, api_key: str):
         """Set the API key dynamically"""
         self.api_key = api_key
+        self._configured = bool(api_key)
 
     def get_coordinates(self, city: str) -> Optional[Dict[str, float]]:
-        """Get coordinates for a city using geocoding API"""
+        """Get coordinates for a city using geocoding API.
+
+        City -> lat/lon is effectively immutable, so successful lookups live
+        forever in a per-instance dict; the TTL/Redis layer underneath still
+        shares results across processes and handles the miss path.
+        """
+        cache_key = city.strip().lower()
+        hit = self._geo_cache.get(cache_key)
+        if hit is not None:
+            return hit
+        key = f"wx:{self.service_type}:coords:{cache_key}"
+        coords = self._cached(key, CACHE_TTL_COORDS, lambda: self._get_coordinates_uncached(city))
+        if coords:
+            if len(self._geo_cache) >= 1024:
+                self._geo_cache.clear()
+            self._geo_cache[cache_key] = coords
+        return coords
+
+    def _get_coordinates_uncached(self, city: str) -> Optional[Dict[str, float]]:
         try:
             url = f"{self.geo_url}/direct"
             params = {
@@ -279,10 +552,10 @@ class WeatherService:
                 'appid': self.api_key
             }
 
-            response = requests.get(url, params=params, timeout=10)
+            response = self._get(url, params=params)
 
             if response.status_code == 200:
-                data = response.json()
+                data = _parse(response)
                 if data:
                     return {
                         'lat': data[0]['lat'],
@@ -298,6 +571,11 @@ class WeatherService:
 
     def get_current_weather(self, city: str) -> Dict[str, Any]:
         """Get current weather for a city with enhanced error handling and fallback"""
+        city = self._clean_city_name(city)
+        key = f"wx:{self.service_type}:current:{city.lower()}"
+        return self._cached(key, CACHE_TTL_CURRENT, lambda: self._get_current_weather_uncached(city))
+
+    def _get_current_weather_uncached(self, city: str) -> Dict[str, Any]:
         try:
             logger.info(f"🌤️ Getting weather for: {city}")
 
@@ -309,9 +587,7 @@ class WeatherService:
                     'fallback_response': f"I'd love to help you check the weather in {city}, but I need a weather API key to be configured. You can set this up in the API settings panel or add WEATHER_API_KEY to your environment variables."
                 }
 
-            # Clean and format city name
-            city = city.strip().title()
-
+            # City arrives pre-cleaned from get_current_weather
             # Try WeatherAPI.com first, then OpenWeatherMap as fallback
             weather_data = self._try_weatherapi_com(city)
 
@@ -329,55 +605,96 @@ class WeatherService:
                 'fallback_response': f"I apologize, but I'm having trouble getting weather information for {city} right now. The weather service might be temporarily unavailable. Please try again in a moment."
             }
 
+    async def get_many(self, cities: List[str]) -> List[Dict[str, Any]]:
+        """Get current weather for several cities concurrently.
+
+        Results come back in the same order as `cities`. Each lookup runs in
+        a worker thread over the pooled session, so a failing city yields its
+        own error dict without affecting the others.
+        """
+        results = await asyncio.gather(
+            *(asyncio.to_thread(self.get_current_weather, city) for city in cities),
+            return_exceptions=True)
+        return [r if not isinstance(r, BaseException)
+                else {'success': False, 'error': str(r)}
+                for r in results]
+
+    async def aget_current_weather(self, city: str) -> Dict[str, Any]:
+        """Async wrapper so event-loop callers don't block on the round-trip.
+
+        One worker thread per call is enough - the pooled session handles
+        socket reuse underneath.
+        """
+        return await asyncio.to_thread(self.get_current_weather, city)
+
+    async def aget_comprehensive_weather(self, city: str, report_type: str = 'current') -> Dict[str, Any]:
+        """Async wrapper for get_comprehensive_weather; see aget_current_weather"""
+        return await asyncio.to_thread(self.get_comprehensive_weather, city, report_type)
+
     def _try_weatherapi_com(self, city: str) -> Dict[str, Any]:
         """Try WeatherAPI.com for weather data"""
         try:
-            # Construct API URL for WeatherAPI.com
+            if self._breaker_is_open():
+                logger.warning("🌤️ WeatherAPI circuit breaker open, skipping request")
+                return dict(self._BREAKER_ERROR)
+
+            # Construct API URL for WeatherAPI.com. Only location/current
+            # fields are consumed downstream, so skip the air-quality block -
+            # it roughly doubles the payload and nothing reads it
             url = f"{self.base_url}/current.json"
             params = {
                 'key': self.api_key,
                 'q': city,
-                'aqi': 'yes'  # Include air quality data
+                'aqi': 'no',
+                'lang': 'en'
             }
 
             logger.info(f"🌤️ Making WeatherAPI.com request to: {url}")
-            logger.info(f"🌤️ Request params: q={city}, aqi=yes")
+            logger.info(f"🌤️ Request params: q={city}, aqi=no")
 
-            response = requests.get(url, params=params, timeout=10)
+            response = self._get(url, params=params)
             logger.info(f"🌤️ WeatherAPI.com response status: {response.status_code}")
+            self._breaker_record(response.status_code)
 
             if response.status_code == 200:
-                data = response.json()
+                data = _parse(response)
                 logger.info("🌤️ Successfully fetched weather data from WeatherAPI.com")
 
+                # Bind the nested dicts once instead of re-walking data[...]
+                # for every field below
+                loc = data['location']
+                current = data['current']
                 return {
                     'success': True,
                     'location': {
-                        'name': data['location']['name'],
-                        'region': data['location']['region'],
-                        'country': data['location']['country'],
-                        'localtime': data['location']['localtime']
+                        'name': loc['name'],
+                        'region': loc['region'],
+                        'country': loc['country'],
+                        'localtime': loc['localtime']
                     },
                     'current': {
-                        'temperature': data['current']['temp_c'],
-                        'temperature_f': data['current']['temp_f'],
-                        'condition': data['current']['condition']['text'],
-                        'humidity': data['current']['humidity'],
-                        'wind_speed': data['current']['wind_kph'],
-                        'wind_direction': data['current']['wind_dir'],
-                        'feels_like': data['current']['feelslike_c'],
-                        'uv_index': data['current']['uv'],
-                        'visibility': data['current']['vis_km']
+                        'temperature': current['temp_c'],
+                        'temperature_f': current['temp_f'],
+                        'condition': current['condition']['text'],
+                        'humidity': current['humidity'],
+                        'wind_speed': current['wind_kph'],
+                        'wind_direction': current['wind_dir'],
+                        'feels_like': current['feelslike_c'],
+                        'uv_index': current['uv'],
+                        'visibility': current['vis_km']
                     },
-                    'air_quality': data.get('current', {}).get('air_quality', {}),
+                    # Kept for response-shape compatibility; always empty now
+                    # that requests go out with aqi=no
+                    'air_quality': current.get('air_quality') or {},
                     'api_used': 'WeatherAPI.com'
                 }
             else:
-                logger.error(f"WeatherAPI.com error: {response.status_code} - {response.text}")
+                snippet = _error_snippet(response)
+                logger.error(f"WeatherAPI.com error: {response.status_code} - {snippet}")
                 return {
                     'success': False,
                     'error': f'WeatherAPI.com error: {response.status_code}',
-                    'details': response.text[:200]
+                    'details': snippet
                 }
 
         except requests.exceptions.Timeout:
@@ -401,33 +718,34 @@ class WeatherService:
 
     def _has_openweather_fallback(self) -> bool:
         """Check if OpenWeatherMap fallback is available"""
-        # Check if we have an OpenWeatherMap API key as fallback
-        openweather_key = os.environ.get('OPENWEATHER_API_KEY')
-        return openweather_key is not None
+        return self._has_openweather
 
     def _try_openweathermap(self, city: str) -> Dict[str, Any]:
         """Try OpenWeatherMap as fallback"""
         try:
-            openweather_key = os.environ.get('OPENWEATHER_API_KEY')
+            openweather_key = self.openweather_api_key
             if not openweather_key:
                 return {
                     'success': False,
                     'error': 'OpenWeatherMap fallback not configured'
                 }
 
-            url = "http://api.openweathermap.org/data/2.5/weather"
+            url = "https://api.openweathermap.org/data/2.5/weather"
             params = {
                 'q': city,
                 'appid': openweather_key,
-                'units': 'metric'
+                'units': 'metric',
+                'lang': 'en'
             }
 
-            response = requests.get(url, params=params, timeout=10)
+            response = self._get(url, params=params)
 
             if response.status_code == 200:
-                data = response.json()
+                data = _parse(response)
                 logger.info("🌤️ Successfully fetched weather data from OpenWeatherMap")
 
+                main = data['main']
+                wind = data.get('wind') or {}
                 return {
                     'success': True,
                     'location': {
@@ -437,13 +755,13 @@ class WeatherService:
                         'localtime': ''
                     },
                     'current': {
-                        'temperature': data['main']['temp'],
-                        'temperature_f': (data['main']['temp'] * 9/5) + 32,
+                        'temperature': main['temp'],
+                        'temperature_f': (main['temp'] * 9/5) + 32,
                         'condition': data['weather'][0]['description'].title(),
-                        'humidity': data['main']['humidity'],
-                        'wind_speed': data.get('wind', {}).get('speed', 0) * 3.6,  # Convert m/s to km/h
+                        'humidity': main['humidity'],
+                        'wind_speed': wind.get('speed', 0) * 3.6,  # Convert m/s to km/h
                         'wind_direction': '',
-                        'feels_like': data['main']['feels_like'],
+                        'feels_like': main['feels_like'],
                         'uv_index': 0,  # Not available in basic OpenWeather
                         'visibility': data.get('visibility', 0) / 1000  # Convert m to km
                     },
@@ -471,13 +789,14 @@ class WeatherService:
                 'lat': lat,
                 'lon': lon,
                 'appid': self.api_key,
-                'units': 'metric'
+                'units': 'metric',
+                'lang': 'en'
             }
 
-            response = requests.get(url, params=params, timeout=10)
+            response = self._get(url, params=params)
 
             if response.status_code == 200:
-                return response.json()
+                return _parse(response)
             else:
                 logger.error(f"Forecast API error: {response.status_code}")
                 return {}
@@ -496,10 +815,10 @@ class WeatherService:
                 'exclude': 'minutely'
             }
 
-            response = requests.get(url, params=params, timeout=10)
+            response = self._get(url, params=params)
 
             if response.status_code == 200:
-                data = response.json()
+                data = _parse(response)
                 return data.get('alerts', [])
             else:
                 logger.error(f"Alerts API error: {response.status_code}")
@@ -525,6 +844,12 @@ class WeatherService:
                 'error': 'Weather API key not configured'
             }
 
+        city = self._clean_city_name(city)
+        key = f"wx:{self.service_type}:comprehensive:{city.lower()}:{report_type}"
+        ttl = CACHE_TTL_CURRENT if report_type == 'current' else CACHE_TTL_FORECAST
+        return self._cached(key, ttl, lambda: self._get_comprehensive_weather_uncached(city, report_type))
+
+    def _get_comprehensive_weather_uncached(self, city: str, report_type: str) -> Dict[str, Any]:
         try:
             # Get coordinates
             coords = self.get_coordinates(city)
@@ -534,8 +859,23 @@ class WeatherService:
                     'error': f'City "{city}" not found'
                 }
 
-            # Get current weather
-            current = self.get_current_weather(coords['name'])
+            # Current conditions, forecast and alerts only depend on the
+            # coordinates, so fan them out concurrently - end-to-end latency
+            # becomes the slowest call instead of the sum of all three
+            need_forecast = report_type in ('hourly', 'daily', 'detailed')
+            need_alerts = report_type == 'detailed'
+
+            with ThreadPoolExecutor(max_workers=3) as pool:
+                current_future = pool.submit(self.get_current_weather, coords['name'])
+                forecast_future = (pool.submit(self.get_hourly_forecast, coords['lat'], coords['lon'])
+                                   if need_forecast else None)
+                alerts_future = (pool.submit(self.get_weather_alerts, coords['lat'], coords['lon'])
+                                 if need_alerts else None)
+
+                current = current_future.result()
+                forecast = forecast_future.result() if forecast_future else None
+                alerts = alerts_future.result() if alerts_future else None
+
             if not current:
                 return {
                     'success': False,
@@ -566,14 +906,11 @@ class WeatherService:
             }
 
             # Add forecast data based on report type
-            if report_type in ['hourly', 'daily', 'detailed']:
-                forecast = self.get_hourly_forecast(coords['lat'], coords['lon'])
-                if forecast:
-                    result['forecast'] = self._process_forecast(forecast, report_type)
+            if forecast:
+                result['forecast'] = self._process_forecast(forecast, report_type)
 
             # Add alerts for detailed reports
-            if report_type == 'detailed':
-                alerts = self.get_weather_alerts(coords['lat'], coords['lon'])
+            if need_alerts:
                 result['alerts'] = alerts
 
             return result
@@ -589,13 +926,15 @@ class WeatherService:
         """Process forecast data based on report type"""
         try:
             forecasts = forecast_data.get('list', [])
+            # Hoisted once; avoids an attribute lookup per forecast entry
+            fromtimestamp = datetime.fromtimestamp
 
             if report_type == 'hourly':
                 # Next 12 hours
                 hourly = []
                 for item in forecasts[:4]:  # 12 hours (3-hour intervals)
                     hourly.append({
-                        'time': datetime.fromtimestamp(item['dt']).strftime('%H:%M'),
+                        'time': fromtimestamp(item['dt']).strftime('%H:%M'),
                         'temperature': round(item['main']['temp']),
                         'description': item['weather'][0]['description'].title(),
                         'precipitation': item.get('rain', {}).get('3h', 0)
@@ -607,7 +946,7 @@ class WeatherService:
                 daily = []
                 current_date = None
                 for item in forecasts:
-                    date = datetime.fromtimestamp(item['dt']).date()
+                    date = fromtimestamp(item['dt']).date()
                     if date != current_date:
                         daily.append({
                             'date': date.strftime('%Y-%m-%d'),
@@ -622,10 +961,31 @@ class WeatherService:
                 return {'daily': daily}
 
             elif report_type == 'detailed':
-                # Both hourly and daily
-                hourly_data = self._process_forecast(forecast_data, 'hourly')
-                daily_data = self._process_forecast(forecast_data, 'daily')
-                return {**hourly_data, **daily_data}
+                # Both hourly and daily, built in one pass so each entry's
+                # timestamp is decoded exactly once
+                hourly, daily, seen_dates = [], [], set()
+                for i, item in enumerate(forecasts):
+                    dt = fromtimestamp(item['dt'])
+                    if i < 4:
+                        hourly.append({
+                            'time': dt.strftime('%H:%M'),
+                            'temperature': round(item['main']['temp']),
+                            'description': item['weather'][0]['description'].title(),
+                            'precipitation': item.get('rain', {}).get('3h', 0)
+                        })
+                    date = dt.date()
+                    if date not in seen_dates and len(daily) < 5:
+                        seen_dates.add(date)
+                        daily.append({
+                            'date': date.strftime('%Y-%m-%d'),
+                            'day': date.strftime('%A'),
+                            'high': round(item['main']['temp_max']),
+                            'low': round(item['main']['temp_min']),
+                            'description': item['weather'][0]['description'].title()
+                        })
+                    if i >= 4 and len(daily) >= 5:
+                        break
+                return {'hourly': hourly, 'daily': daily}
 
         except Exception as e:
             logger.error(f"Forecast processing error: {e}")
@@ -643,59 +1003,42 @@ class WeatherService:
         current = weather_data['current']
         report_type = weather_data['report_type']
 
-        if persona == 'pirate':
-            response = f"Ahoy! Here be the weather report for {location['city']}"
-            if location.get('state'):
-                response += f", {location['state']}"
-            if location.get('country'):
-                response += f" in {location['country']}"
-            response += "!\n\n"
+        # Accumulate fragments and join once - repeated += on a long response
+        # string reallocates the whole string per statement
+        tmpl = _RESPONSE_TEMPLATES.get(persona, _RESPONSE_TEMPLATES['default'])
 
-            response += f"🌡️ Current conditions: {current['temperature']}°C, feelin' like {current['feels_like']}°C\n"
-            response += f"☁️ Sky conditions: {current['description']}\n"
-            response += f"💨 Wind blowin' at {current['wind_speed']} kph\n"
-            response += f"💧 Humidity: {current['humidity']}%\n\n"
+        parts = [tmpl['header'].format(city=location['city'])]
+        if location.get('state'):
+            parts.append(tmpl['state'].format(state=location['state']))
+        if location.get('country'):
+            parts.append(tmpl['country'].format(country=location['country']))
+        parts.append(tmpl['header_end'])
 
-        else:
-            response = f"Weather Report for {location['city']}"
-            if location.get('state'):
-                response += f", {location['state']}"
-            if location.get('country'):
-                response += f", {location['country']}"
-            response += "\n\n"
-
-            response += f"🌡️ Current: {current['temperature']}°C (feels like {current['feels_like']}°C)\n"
-            response += f"☁️ Conditions: {current['description']}\n"
-            response += f"💨 Wind: {current['wind_speed']} kph\n"
-            response += f"💧 Humidity: {current['humidity']}%\n"
-            response += f"👁️ Visibility: {current['visibility']} km\n\n"
+        parts.append(tmpl['current'].format_map(current))
 
         # Add forecast information
         if 'forecast' in weather_data:
             forecast = weather_data['forecast']
 
             if 'hourly' in forecast:
-                response += "📅 Next 12 Hours:\n"
-                for hour in forecast['hourly']:
-                    response += f"  {hour['time']}: {hour['temperature']}°C, {hour['description']}\n"
-                response += "\n"
+                parts.append("📅 Next 12 Hours:\n")
+                parts.extend(f"  {hour['time']}: {hour['temperature']}°C, {hour['description']}\n"
+                             for hour in forecast['hourly'])
+                parts.append("\n")
 
             if 'daily' in forecast:
-                response += "📊 5-Day Forecast:\n"
-                for day in forecast['daily']:
-                    response += f"  {day['day']}: {day['high']}°C/{day['low']}°C, {day['description']}\n"
-                response += "\n"
+                parts.append("📊 5-Day Forecast:\n")
+                parts.extend(f"  {day['day']}: {day['high']}°C/{day['low']}°C, {day['description']}\n"
+                             for day in forecast['daily'])
+                parts.append("\n")
 
         # Add alerts
         if 'alerts' in weather_data and weather_data['alerts']:
-            response += "⚠️ Weather Alerts:\n"
-            for alert in weather_data['alerts'][:2]:  # Show max 2 alerts
-                response += f"  • {alert.get('event', 'Weather Alert')}\n"
-            response += "\n"
+            parts.append("⚠️ Weather Alerts:\n")
+            parts.extend(f"  • {alert.get('event', 'Weather Alert')}\n"
+                         for alert in weather_data['alerts'][:2])
+            parts.append("\n")
 
-        if persona == 'pirate':
-            response += "Stay safe on the seas, matey! ⚓"
-        else:
-            response += "Stay safe and prepared! 🌟"
+        parts.append(tmpl['footer'])
 
-        return response
+        return ''.join(parts)
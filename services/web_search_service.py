@@ -3,26 +3,324 @@ Web Search Service - Special Skill for VoxAura Agent
 Provides web search functionality using DuckDuckGo (no API key required)
 """
 import os
+import re
+import time
+import random
+import atexit
+import asyncio
 import logging
 import requests
 import json
-from typing import Dict, Any, Optional
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List
 import urllib.parse
-from duckduckgo_search import DDGS
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
+# DuckDuckGo's HTML endpoints, used by the async path so searches don't
+# block the event loop behind the DDGS client. The full and lite pages are
+# served by separate frontends, which makes them useful hedging partners.
+_DDG_HTML_URL = "https://html.duckduckgo.com/html/"
+_DDG_LITE_URL = "https://lite.duckduckgo.com/lite/"
+
+# Result cache bounds: search results go stale quickly, so entries are
+# short-lived, and the LRU cap keeps memory flat under query churn
+_CACHE_MAX_ENTRIES = 512
+_CACHE_TTL = 300
+
+_WS_RE = re.compile(r'\s+')
+
+# Special characters (#, *, newlines...) in the query string reliably draw
+# rate-limit responses from DuckDuckGo, so strip them before searching
+_SANITIZE_RE = re.compile(r'[^A-Za-z0-9 ]+')
+
+# Per-result block for format_search_response, parsed once at import and
+# rendered with .format instead of rebuilding f-strings in the loop
+_RESULT_TMPL = "{i}. **{title}**\n   {snippet}...\n   Source: {url}\n\n"
+
+# Knowledge-base fallback dispatch, compiled once at import. Each category
+# is an alternation of its trigger terms scanned at C level, checked in
+# precedence order - replaces per-call list building and ~40 Python-level
+# substring tests. Terms keep the original substring semantics.
+_KB_CATEGORIES = [
+    ('ai_tech', ['ai', 'artificial intelligence', 'machine learning', 'ml']),
+    ('llm', ['llm', 'large language model', 'language model']),
+    ('chatgpt', ['chatgpt', 'gpt', 'openai']),
+    ('programming', ['programming', 'coding', 'development', 'software']),
+    ('languages', ['python', 'javascript', 'java', 'c++', 'html', 'css']),
+    ('science', ['science', 'physics', 'chemistry', 'biology']),
+    ('history', ['history', 'historical', 'past']),
+    ('weather', ['weather', 'climate', 'temperature']),
+]
+
+_KB_PATTERNS = [(category, re.compile('|'.join(re.escape(t) for t in terms)))
+                for category, terms in _KB_CATEGORIES]
+
+# Fast tier: single-word terms resolve with one dict hit per query token,
+# so most queries never reach the regex scans. Rank preserves the category
+# precedence of the table above when several tokens match.
+_KB_CATEGORY_RANK = {category: rank for rank, (category, _) in enumerate(_KB_CATEGORIES)}
+_KB_TERM_TO_CATEGORY = {term: category
+                        for category, terms in _KB_CATEGORIES
+                        for term in terms if ' ' not in term}
+
+_KB_RESPONSES = {
+    'ai_tech': "AI (Artificial Intelligence) refers to computer systems that can perform tasks typically requiring human intelligence. This includes machine learning, natural language processing, computer vision, and robotics. Modern AI like ChatGPT, Google's Gemini, and other LLMs use deep learning neural networks trained on vast datasets.",
+    'llm': "LLM stands for Large Language Model. These are AI systems trained on massive amounts of text data to understand and generate human-like responses. Examples include GPT (OpenAI), Claude (Anthropic), Gemini (Google), and LLaMA (Meta). They can help with writing, coding, analysis, and conversation.",
+    'chatgpt': "ChatGPT is an AI chatbot developed by OpenAI, based on their GPT (Generative Pre-trained Transformer) language models. It can engage in conversations, answer questions, help with writing, coding, and various other tasks using natural language processing.",
+    'programming': "Programming is the process of creating computer software using programming languages like Python, JavaScript, Java, C++, and others. It involves writing instructions that computers can execute to solve problems and create applications.",
+    'languages': "You're asking about {query}! This appears to be related to programming or web development. These are popular technologies used to build software applications and websites. Would you like more specific information about any particular aspect?",
+    'science': "You're asking about {query} in science! This is a broad field with many fascinating aspects. Science helps us understand the natural world through observation, experimentation, and analysis. What specific area interests you most?",
+    'history': "You're asking about {query} in history! History helps us understand past events, cultures, and civilizations. It provides valuable lessons and context for understanding our present world. What particular period or aspect interests you?",
+    'weather': "I can help with weather information! Try asking about the weather in a specific city, like 'What's the weather in New York?' I can provide current conditions, forecasts, and more detailed weather analysis.",
+}
+
+def _parse_ddg_html(html: str, max_results: int) -> List[Dict[str, str]]:
+    """Extract title/snippet/url results from the DuckDuckGo HTML page"""
+    from bs4 import BeautifulSoup
+
+    results = []
+    soup = BeautifulSoup(html, 'lxml')
+    for node in soup.select('.result')[:max_results]:
+        title_node = node.select_one('.result__a')
+        snippet_node = node.select_one('.result__snippet')
+        if not title_node:
+            continue
+        results.append({
+            'title': title_node.get_text(strip=True),
+            # Truncated once at ingest; render paths use it as-is
+            'snippet': snippet_node.get_text(strip=True)[:150] if snippet_node else '',
+            'url': title_node.get('href', ''),
+            'source': 'DuckDuckGo'
+        })
+    return results
+
+def _parse_ddg_lite(html: str, max_results: int) -> List[Dict[str, str]]:
+    """Extract results from the DuckDuckGo lite (table-based) page"""
+    from bs4 import BeautifulSoup
+
+    results = []
+    soup = BeautifulSoup(html, 'lxml')
+    links = soup.select('a.result-link')
+    snippets = soup.select('td.result-snippet')
+    for i, link in enumerate(links[:max_results]):
+        snippet = snippets[i].get_text(strip=True) if i < len(snippets) else ''
+        results.append({
+            'title': link.get_text(strip=True),
+            'snippet': snippet[:150],
+            'url': link.get('href', ''),
+            'source': 'DuckDuckGo'
+        })
+    return results
+
 class WebSearchService:
+    # Lazily imported duckduckgo_search handles, cached at class level so
+    # the heavy import graph is paid on the first search, not at startup
+    _DDGS = None
+    _RatelimitException = None
+
+    @classmethod
+    def _import_ddgs(cls):
+        """Import and cache the DDGS client class on first use"""
+        if cls._DDGS is None:
+            from duckduckgo_search import DDGS
+            cls._DDGS = DDGS
+            try:
+                from duckduckgo_search.exceptions import RatelimitException
+                cls._RatelimitException = RatelimitException
+            except ImportError:
+                pass
+        return cls._DDGS
+
     def __init__(self):
         """Initialize web search service using DuckDuckGo Instant Answer API"""
         self.base_url = "https://api.duckduckgo.com/"
+
+        # Pooled session with keep-alive for direct DuckDuckGo HTTP calls -
+        # skips the fresh TCP+TLS handshake that otherwise dominates each
+        # search, and retries transient rate-limit/5xx responses
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=Retry(total=2, backoff_factor=1,
+                              status_forcelist=[429, 500, 502, 503]))
+        self._session.mount('https://', adapter)
+        self._session.headers['User-Agent'] = (
+            'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 '
+            '(KHTML, like Gecko) Chrome/120.0 Safari/537.36')
+        atexit.register(self._session.close)
+
+        # Reused DDGS client; constructing one per search threw away its
+        # underlying connection pool every time. DDGS doesn't accept an
+        # external session, so it keeps its own pool alongside ours.
+        self._ddgs = None
+
+        # LRU of recent results keyed by the whitespace/case-normalized
+        # query; a hit skips the whole HTTP + parse path
+        self._result_cache = OrderedDict()
+
         logger.info("✅ Web search service initialized (DuckDuckGo)")
 
+    def _get_ddgs(self):
+        """Return the shared DDGS client, creating it on first use"""
+        if self._ddgs is None:
+            self._ddgs = self._import_ddgs()()
+        return self._ddgs
+
+    def _cache_lookup(self, key) -> Optional[Dict[str, Any]]:
+        """Return a fresh cached search result, or None.
+
+        Keys are (normalized query, max_results) tuples - a result set
+        cached for one result count must not answer a different one.
+        """
+        entry = self._result_cache.get(key)
+        if entry is None:
+            return None
+        value, expires = entry
+        if expires < time.monotonic():
+            del self._result_cache[key]
+            return None
+        self._result_cache.move_to_end(key)
+        return value
+
+    def _cache_store(self, key, value: Dict[str, Any]):
+        """Cache a successful search result with LRU eviction"""
+        self._result_cache[key] = (value, time.monotonic() + _CACHE_TTL)
+        self._result_cache.move_to_end(key)
+        while len(self._result_cache) > _CACHE_MAX_ENTRIES:
+            self._result_cache.popitem(last=False)
+
+    async def search_web_async(self, query: str, max_results: int = 5) -> Dict[str, Any]:
+        """Async web search hedged across DuckDuckGo's full and lite pages.
+
+        Both endpoints are queried concurrently and the first non-empty
+        result set wins, so latency is min(endpoints) instead of serial
+        retries; the loser is cancelled. aiohttp keeps pending searches off
+        the worker threads entirely.
+        """
+        import aiohttp
+
+        try:
+            logger.info(f"🔍 Async web search for: {query}")
+
+            cache_key = (_WS_RE.sub(' ', query.strip().lower()), max_results)
+            cached = self._cache_lookup(cache_key)
+            if cached is not None:
+                logger.info("🔍 Returning cached search results")
+                return cached
+
+            clean_query = _SANITIZE_RE.sub(' ', query).strip() or query
+
+            async def fetch(session, url, parser):
+                async with session.get(url, params={'q': clean_query}) as resp:
+                    if resp.status != 200:
+                        logger.warning(f"🔍 {url} returned {resp.status}")
+                        return []
+                    return parser(await resp.text(), max_results)
+
+            timeout = aiohttp.ClientTimeout(total=5)
+            async with aiohttp.ClientSession(timeout=timeout) as session:
+                pending = {
+                    asyncio.create_task(fetch(session, _DDG_HTML_URL, _parse_ddg_html)),
+                    asyncio.create_task(fetch(session, _DDG_LITE_URL, _parse_ddg_lite)),
+                }
+                results = []
+                try:
+                    while pending and not results:
+                        done, pending = await asyncio.wait(
+                            pending, return_when=asyncio.FIRST_COMPLETED, timeout=5)
+                        if not done:  # overall timeout
+                            break
+                        for task in done:
+                            try:
+                                candidate = task.result()
+                            except Exception as search_error:
+                                logger.warning(f"🔍 Hedged search leg failed: {search_error}")
+                                continue
+                            if candidate:
+                                results = candidate
+                                break
+                finally:
+                    for task in pending:
+                        task.cancel()
+
+                if results:
+                    response = {
+                        'success': True,
+                        'results': results,
+                        'query': query,
+                        'result_count': len(results),
+                        'search_engine': 'DuckDuckGo'
+                    }
+                    self._cache_store(cache_key, response)
+                    return response
+
+            fallback_response = self._get_knowledge_based_response(query)
+            return {
+                'success': True,
+                'results': [],
+                'query': query,
+                'result_count': 0,
+                'search_engine': 'Knowledge Base (Fallback)',
+                'fallback_needed': True,
+                'fallback_response': fallback_response,
+                'error': 'Search temporarily unavailable - using built-in knowledge'
+            }
+
+        except Exception as e:
+            logger.error(f"Async web search error: {str(e)}")
+            return {
+                'success': True,
+                'error': f'Web search temporarily unavailable: {str(e)}',
+                'results': [],
+                'query': query,
+                'result_count': 0,
+                'fallback_needed': True,
+                'fallback_response': self._get_knowledge_based_response(query)
+            }
+
     def search_web(self, query: str, max_results: int = 5) -> Dict[str, Any]:
         """Search the web using DuckDuckGo with improved error handling and rate limit management"""
         try:
             logger.info(f"🔍 Searching web for: {query}")
 
+            cache_key = (_WS_RE.sub(' ', query.strip().lower()), max_results)
+            cached = self._cache_lookup(cache_key)
+            if cached is not None:
+                logger.info("🔍 Returning cached search results")
+                return cached
+
+            # Sanitized query goes to DuckDuckGo; the original stays in the
+            # response and cache key
+            clean_query = _SANITIZE_RE.sub(' ', query).strip() or query
+
+            # Fast path: fetch the HTML endpoint over the pooled session and
+            # parse with lxml-backed BeautifulSoup - cheaper per attempt than
+            # the DDGS client and reuses our keep-alive connections. DDGS
+            # below stays as the fallback when this yields nothing.
+            try:
+                resp = self._session.get(_DDG_HTML_URL, params={'q': clean_query}, timeout=5)
+                if resp.status_code == 200:
+                    results = _parse_ddg_html(resp.text, max_results)
+                    if results:
+                        logger.info(f"🔍 Found {len(results)} results via HTML endpoint")
+                        response = {
+                            'success': True,
+                            'results': results,
+                            'query': query,
+                            'result_count': len(results),
+                            'search_engine': 'DuckDuckGo'
+                        }
+                        self._cache_store(cache_key, response)
+                        return response
+                else:
+                    logger.warning(f"🔍 HTML endpoint returned {resp.status_code}")
+            except requests.RequestException as html_error:
+                logger.warning(f"🔍 HTML endpoint search failed: {html_error}")
+
             # Use DuckDuckGo search with better rate limiting handling
             results = []
             search_attempts = 0
@@ -33,30 +331,27 @@ class WebSearchService:
                     search_attempts += 1
                     logger.info(f"🔍 Search attempt {search_attempts}/{max_attempts}")
 
-                    # Add longer delay between attempts to avoid rate limiting
-                    if search_attempts > 1:
-                        import time
-                        time.sleep(3)  # Longer wait time
-
-                    with DDGS() as ddgs:
-                        # Use different parameters to avoid rate limiting
-                        search_results = ddgs.text(
-                            query, 
-                            max_results=min(max_results, 3),  # Limit results to reduce load
-                            safesearch='moderate',
-                            region='wt-wt',  # Use worldwide region
-                            timelimit=None
-                        )
-
-                        for result in search_results:
-                            if len(results) >= max_results:
-                                break
-                            results.append({
-                                'title': result.get('title', ''),
-                                'snippet': result.get('body', ''),
-                                'url': result.get('href', ''),
-                                'source': 'DuckDuckGo'
-                            })
+                    ddgs = self._get_ddgs()
+                    # Use different parameters to avoid rate limiting
+                    search_results = ddgs.text(
+                        clean_query,
+                        max_results=min(max_results, 3),  # Limit results to reduce load
+                        safesearch='moderate',
+                        region='wt-wt',  # Use worldwide region
+                        timelimit=None
+                    )
+
+                    for result in search_results:
+                        if len(results) >= max_results:
+                            break
+                        results.append({
+                            'title': result.get('title', ''),
+                            # Truncated once at ingest so every later render
+                            # (and cached reuse) skips the slice
+                            'snippet': result.get('body', '')[:150],
+                            'url': result.get('href', ''),
+                            'source': 'DuckDuckGo'
+                        })
 
                     if len(results) > 0:
                         break
@@ -64,15 +359,20 @@ class WebSearchService:
                 except Exception as search_error:
                     error_msg = str(search_error).lower()
                     logger.warning(f"🔍 Search attempt {search_attempts} failed: {str(search_error)}")
-                    
+                    self._ddgs = None  # Rebuild the client on the next attempt
+
                     # Check if it's a rate limit error
-                    if 'ratelimit' in error_msg or 'rate limit' in error_msg:
+                    ratelimit_exc = type(self)._RatelimitException
+                    if ((ratelimit_exc is not None and
+                         isinstance(search_error, ratelimit_exc)) or
+                            'ratelimit' in error_msg or 'rate limit' in error_msg):
                         logger.warning("🔍 Rate limit detected, using fallback knowledge")
                         break  # Don't retry on rate limit
-                    
+
                     if search_attempts < max_attempts:
-                        import time
-                        time.sleep(2)  # Wait before retry
+                        # Exponential backoff with jitter so concurrent
+                        # retries don't stampede the endpoint in sync
+                        time.sleep(min(16, 2 ** search_attempts) + random.random())
 
             logger.info(f"🔍 Found {len(results)} search results after {search_attempts} attempts")
 
@@ -90,13 +390,15 @@ class WebSearchService:
                     'error': 'Search temporarily unavailable - using built-in knowledge'
                 }
 
-            return {
+            response = {
                 'success': True,
                 'results': results,
                 'query': query,
                 'result_count': len(results),
                 'search_engine': 'DuckDuckGo'
             }
+            self._cache_store(cache_key, response)
+            return response
 
         except Exception as e:
             logger.error(f"Web search error: {str(e)}")
@@ -123,36 +425,22 @@ class WebSearchService:
     def _get_knowledge_based_response(self, query: str) -> str:
         """Provide knowledge-based responses for common queries when search fails"""
         query_lower = query.lower().strip()
-        
-        # AI and Technology related queries
-        if any(term in query_lower for term in ['ai', 'artificial intelligence', 'machine learning', 'ml']):
-            return "AI (Artificial Intelligence) refers to computer systems that can perform tasks typically requiring human intelligence. This includes machine learning, natural language processing, computer vision, and robotics. Modern AI like ChatGPT, Google's Gemini, and other LLMs use deep learning neural networks trained on vast datasets."
-        
-        elif any(term in query_lower for term in ['llm', 'large language model', 'language model']):
-            return "LLM stands for Large Language Model. These are AI systems trained on massive amounts of text data to understand and generate human-like responses. Examples include GPT (OpenAI), Claude (Anthropic), Gemini (Google), and LLaMA (Meta). They can help with writing, coding, analysis, and conversation."
-        
-        elif any(term in query_lower for term in ['chatgpt', 'gpt', 'openai']):
-            return "ChatGPT is an AI chatbot developed by OpenAI, based on their GPT (Generative Pre-trained Transformer) language models. It can engage in conversations, answer questions, help with writing, coding, and various other tasks using natural language processing."
-        
-        elif any(term in query_lower for term in ['programming', 'coding', 'development', 'software']):
-            return "Programming is the process of creating computer software using programming languages like Python, JavaScript, Java, C++, and others. It involves writing instructions that computers can execute to solve problems and create applications."
-        
-        elif any(term in query_lower for term in ['python', 'javascript', 'java', 'c++', 'html', 'css']):
-            return f"You're asking about {query}! This appears to be related to programming or web development. These are popular technologies used to build software applications and websites. Would you like more specific information about any particular aspect?"
-        
-        # Science and general knowledge
-        elif any(term in query_lower for term in ['science', 'physics', 'chemistry', 'biology']):
-            return f"You're asking about {query} in science! This is a broad field with many fascinating aspects. Science helps us understand the natural world through observation, experimentation, and analysis. What specific area interests you most?"
-        
-        elif any(term in query_lower for term in ['history', 'historical', 'past']):
-            return f"You're asking about {query} in history! History helps us understand past events, cultures, and civilizations. It provides valuable lessons and context for understanding our present world. What particular period or aspect interests you?"
-        
-        elif any(term in query_lower for term in ['weather', 'climate', 'temperature']):
-            return "I can help with weather information! Try asking about the weather in a specific city, like 'What's the weather in New York?' I can provide current conditions, forecasts, and more detailed weather analysis."
-        
+
+        # Fast tier: O(1) dict lookups over the query tokens
+        hits = [_KB_TERM_TO_CATEGORY[tok] for tok in query_lower.split()
+                if tok in _KB_TERM_TO_CATEGORY]
+        if hits:
+            category = min(hits, key=_KB_CATEGORY_RANK.__getitem__)
+            return _KB_RESPONSES[category].format(query=query)
+
+        # Slow tier: substring scan catches multi-word terms and terms
+        # embedded in punctuation
+        for category, pattern in _KB_PATTERNS:
+            if pattern.search(query_lower):
+                return _KB_RESPONSES[category].format(query=query)
+
         # Default response for unknown queries
-        else:
-            return f"I'd be happy to help you learn about '{query}'! While I can't search the web right now, I can provide general information. Could you ask a more specific question about what aspect of '{query}' interests you most?"
+        return f"I'd be happy to help you learn about '{query}'! While I can't search the web right now, I can provide general information. Could you ask a more specific question about what aspect of '{query}' interests you most?"
 
     def format_search_response(self, search_data: Dict[str, Any], persona: str = None) -> str:
         """Format search results into natural language response"""
@@ -182,20 +470,19 @@ class WebSearchService:
             else:
                 return fallback_response
 
-        # Format results
+        # Format results with list-append + join instead of repeated string
+        # concatenation (each += reallocates the whole response so far)
         if persona == 'pirate':
-            response = f"Ahoy! I found some treasure while searchin' for '{query}':\n\n"
-            for i, result in enumerate(results[:3], 1):
-                response += f"{i}. **{result['title']}**\n"
-                response += f"   {result['snippet'][:150]}...\n"
-                response += f"   Source: {result['url']}\n\n"
-            response += "These be the finest results from me search, matey! ⚓"
+            parts = [f"Ahoy! I found some treasure while searchin' for '{query}':\n\n"]
+            footer = "These be the finest results from me search, matey! ⚓"
         else:
-            response = f"Here's what I found about '{query}':\n\n"
-            for i, result in enumerate(results[:3], 1):
-                response += f"{i}. **{result['title']}**\n"
-                response += f"   {result['snippet'][:150]}...\n"
-                response += f"   Source: {result['url']}\n\n"
-            response += f"Found {search_data['result_count']} results using {search_data['search_engine']}."
-
-        return response
+            parts = [f"Here's what I found about '{query}':\n\n"]
+            footer = f"Found {search_data['result_count']} results using {search_data['search_engine']}."
+
+        parts.extend(
+            _RESULT_TMPL.format(i=i, title=result['title'],
+                                snippet=result['snippet'],
+                                url=result['url'])
+            for i, result in enumerate(results[:3], 1))
+        parts.append(footer)
+        return ''.join(parts)
@@ -1,10 +1,14 @@
 import os
 import json
+import time
 import asyncio
 import threading
 import queue
 import base64
 import logging
+import dataclasses
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Dict, Any, Optional
 from flask_socketio import emit
@@ -15,6 +19,18 @@ from .murf_websocket_service import MurfWebSocketService
 
 logger = logging.getLogger(__name__)
 
+@dataclass(slots=True)
+class _Session:
+    """Per-socket session record; slotted so bumping message_count is a
+    direct attribute increment instead of a dict hash + lookup.
+
+    connected_ns holds the raw clock reading - most sessions are never
+    inspected, so the ISO string is rendered lazily in get_session_info.
+    """
+    session_id: str
+    connected_ns: int
+    message_count: int = 0
+
 class WebSocketService:
     """Service for managing WebSocket communications with Day 21 audio streaming"""
 
@@ -22,7 +38,10 @@ class WebSocketService:
         self.llm_service = llm_service
         self.tts_service = tts_service
         self.active_sessions = {}
-        self.message_cache = {}
+        # Per-socket stream-file state, LRU-bounded so entries from sockets
+        # that never cleanly disconnect can't accumulate forever
+        self.message_cache = OrderedDict()
+        self._message_cache_max = 10_000
         self.transcription_sessions = {}
         self.active_transcriptions = {}
         self.murf_sessions = set()
@@ -36,13 +55,106 @@ class WebSocketService:
         self.llm_service = LLMService()
         self.murf_service = MurfWebSocketService()
 
+        # (iso_string, epoch_ms) pair backing _now_iso
+        self._ts_cache = ("", 0)
+
+        # Set by main.py after SocketIO is constructed; used for broadcasts
+        # and Day 21 audio streaming
+        self.socketio = None
+
+        # Coalescing outbox for broadcast_system_message: frames collect
+        # here and flush as one batched emit every <=20ms (or immediately
+        # at 32 pending), amortizing framing + syscall cost per client
+        self._outbox = []
+        self._outbox_lock = threading.Lock()
+        self._flush_task_started = False
+
+        # Reused envelope for single-message flushes (the common heartbeat
+        # case). Socket.IO serializes at emit time, so mutating the same
+        # dict between flushes is safe and skips a dict allocation per
+        # broadcast.
+        self._bcast_tmpl = {'message': None, 'timestamp': None, 'type': 'broadcast'}
+
+        # Bounded work queue for handle_chat_message_async: handlers enqueue
+        # and ack immediately, worker tasks do the LLM round-trip, and a full
+        # queue surfaces as backpressure instead of unbounded buffering
+        self._work_q = queue.Queue(maxsize=1024)
+        self._workers_started = False
+        self._worker_count = 4
+
+    @staticmethod
+    def _payload_size(payload) -> int:
+        """Size of an inbound payload in O(1) without copying it.
+
+        memoryview reports byte counts for bytes-like objects directly; a
+        str()/serialize round-trip just to measure would walk and copy the
+        whole buffer per audio frame.
+        """
+        if payload is None:
+            return 0
+        if isinstance(payload, (bytes, bytearray, memoryview)):
+            return memoryview(payload).nbytes
+        try:
+            return len(payload)
+        except TypeError:
+            return 0
+
+    def _now_iso(self) -> str:
+        """ISO timestamp for outbound frames, cached per millisecond.
+
+        Messages arrive far more often than the clock tick matters, so this
+        avoids a datetime allocation + strftime-style formatting per frame.
+        """
+        ms = time.time_ns() // 1_000_000
+        if ms != self._ts_cache[1]:
+            self._ts_cache = (datetime.now().isoformat(), ms)
+        return self._ts_cache[0]
+
+    def broadcast_system_message(self, message: str):
+        """Queue a system message for broadcast to all connected clients.
+
+        Messages are coalesced and emitted as a 'system_message_batch' list
+        by the background flush task, so N messages inside the window cost
+        one emit per client instead of N.
+        """
+        with self._outbox_lock:
+            self._outbox.append({'message': message, 'timestamp': self._now_iso()})
+            flush_now = len(self._outbox) >= 32
+            if self.socketio is not None and not self._flush_task_started:
+                self._flush_task_started = True
+                self.socketio.start_background_task(self._flush_outbox)
+        if flush_now:
+            self._drain_outbox()
+
+    def _drain_outbox(self):
+        """Emit any pending broadcast frames as a single batch"""
+        with self._outbox_lock:
+            batch, self._outbox = self._outbox, []
+        if not batch or self.socketio is None:
+            return
+        if len(batch) == 1:
+            # Single message: mutate the cached envelope in place instead
+            # of allocating a fresh dict per broadcast
+            entry = batch[0]
+            tmpl = self._bcast_tmpl
+            tmpl['message'] = entry['message']
+            tmpl['timestamp'] = entry['timestamp']
+            self.socketio.emit('system_message', tmpl)
+        else:
+            self.socketio.emit('system_message_batch', batch)
+
+    def _flush_outbox(self):
+        """Background task draining the broadcast outbox every 20ms"""
+        while True:
+            self.socketio.sleep(0.02)
+            self._drain_outbox()
+
     def register_session(self, session_id: str, socket_id: str):
         """Register a new session"""
-        self.active_sessions[socket_id] = {
-            'session_id': session_id,
-            'connected_at': datetime.now().isoformat(),
-            'message_count': 0
-        }
+        self.active_sessions[socket_id] = _Session(
+            session_id=session_id,
+            connected_ns=time.time_ns()
+        )
 
         # Initialize Day 21 audio streaming for session
         self.audio_streams[socket_id] = {
@@ -58,7 +170,7 @@ class WebSocketService:
         """Unregister a session"""
         if socket_id in self.active_sessions:
             session_info = self.active_sessions.pop(socket_id)
-            logger.info(f"Unregistered session {session_info['session_id']} for socket {socket_id}")
+            logger.info(f"Unregistered session {session_info.session_id} for socket {socket_id}")
 
         # Clean up transcription sessions
         if socket_id in self.transcription_sessions:
@@ -74,17 +186,21 @@ class WebSocketService:
         if socket_id in self.streaming_chunks:
             del self.streaming_chunks[socket_id]
 
+        # Drop any cached stream-file state for this socket
+        self.message_cache.pop(socket_id, None)
+
     def handle_echo_message(self, socket_id: str, message: str) -> Dict[str, Any]:
         """Handle echo message functionality"""
         response_data = {
             'original_message': message,
             'echo_response': f"Echo: {message}",
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': self._now_iso(),
             'socket_id': socket_id
         }
 
-        if socket_id in self.active_sessions:
-            self.active_sessions[socket_id]['message_count'] += 1
+        sess = self.active_sessions.get(socket_id)
+        if sess:
+            sess.message_count += 1
 
         return response_data
 
@@ -101,7 +217,7 @@ class WebSocketService:
                 return {
                     'error': 'Empty message',
                     'socket_id': socket_id,
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': self._now_iso()
                 }
 
             # DAY 18: Simulate turn detection for text input
@@ -142,7 +258,7 @@ class WebSocketService:
                     'message': message,
                     'response': response_text,
                     'socket_id': socket_id,
-                    'timestamp': datetime.now().isoformat(),
+                    'timestamp': self._now_iso(),
                     'day_features': {
                         'day18_turn_detection': 'completed',
                         'day19_streaming_llm': f"{len(streaming_chunks)} chunks",
@@ -158,7 +274,7 @@ class WebSocketService:
                     'error': result.get('error', 'LLM processing failed'),
                     'fallback_response': result.get('fallback_response'),
                     'socket_id': socket_id,
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': self._now_iso()
                 }
 
         except Exception as e:
@@ -167,9 +283,54 @@ class WebSocketService:
             return {
                 'error': str(e),
                 'socket_id': socket_id,
-                'timestamp': datetime.now().isoformat()
+                'timestamp': self._now_iso()
             }
 
+    def handle_chat_message_async(self, socket_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Queue a chat message for background processing and ack at once.
+
+        The heavy LLM round-trip runs on a worker task and its result is
+        emitted as 'chat_response' to the socket, so the receiving handler
+        returns in microseconds. A full queue returns a throttled status
+        rather than buffering without bound.
+        """
+        self._ensure_workers()
+        try:
+            self._work_q.put_nowait((socket_id, data))
+        except queue.Full:
+            logger.warning(f"Chat work queue full, throttling {socket_id}")
+            return {
+                'status': 'throttled',
+                'error': 'Server busy, please retry shortly',
+                'socket_id': socket_id,
+                'timestamp': self._now_iso()
+            }
+        return {
+            'status': 'queued',
+            'socket_id': socket_id,
+            'timestamp': self._now_iso()
+        }
+
+    def _ensure_workers(self):
+        """Start the chat worker tasks on first use"""
+        if self._workers_started or self.socketio is None:
+            return
+        self._workers_started = True
+        for _ in range(self._worker_count):
+            self.socketio.start_background_task(self._chat_worker)
+
+    def _chat_worker(self):
+        """Drain queued chat messages and emit results to their sockets"""
+        while True:
+            socket_id, data = self._work_q.get()
+            try:
+                result = self.handle_chat_message(socket_id, data)
+                self.socketio.emit('chat_response', result, to=socket_id)
+            except Exception as e:
+                logger.error(f"Chat worker error: {str(e)}")
+            finally:
+                self._work_q.task_done()
+
     def handle_audio_stream(self, socket_id: str, audio_data: Any) -> Dict[str, Any]:
         """Handle streaming audio data and save to file"""
         import os
@@ -179,10 +340,12 @@ class WebSocketService:
             streams_dir = os.path.join(os.getcwd(), 'instance', 'audio_streams')
             os.makedirs(streams_dir, exist_ok=True)
 
-            session_info = self.active_sessions.get(socket_id, {})
-            session_id = session_info.get('session_id', 'unknown')
+            session_info = self.active_sessions.get(socket_id)
+            session_id = session_info.session_id if session_info else 'unknown'
 
             if socket_id not in self.message_cache:
+                while len(self.message_cache) >= self._message_cache_max:
+                    self.message_cache.popitem(last=False)
                 self.message_cache[socket_id] = {
                     'stream_file': os.path.join(streams_dir, f'stream_{session_id}_{socket_id}.webm'),
                     'chunk_count': 0
@@ -203,7 +366,7 @@ class WebSocketService:
                 response = {
                     'status': 'saved',
                     'message': f'Audio chunk {stream_info["chunk_count"]} saved to file',
-                    'timestamp': datetime.now().isoformat(),
+                    'timestamp': self._now_iso(),
                     'socket_id': socket_id,
                     'session_id': session_id,
                     'file_path': stream_info['stream_file'],
@@ -213,7 +376,7 @@ class WebSocketService:
                 response = {
                     'status': 'error',
                     'message': 'Invalid audio data format',
-                    'timestamp': datetime.now().isoformat(),
+                    'timestamp': self._now_iso(),
                     'socket_id': socket_id
                 }
 
@@ -222,7 +385,7 @@ class WebSocketService:
             response = {
                 'status': 'error',
                 'message': f'Error saving audio: {str(e)}',
-                'timestamp': datetime.now().isoformat(),
+                'timestamp': self._now_iso(),
                 'socket_id': socket_id
             }
 
@@ -230,7 +393,15 @@ class WebSocketService:
 
     def get_session_info(self, socket_id: str) -> Dict[str, Any]:
         """Get information about a session"""
-        return self.active_sessions.get(socket_id, {})
+        sess = self.active_sessions.get(socket_id)
+        if not sess:
+            return {}
+        info = dataclasses.asdict(sess)
+        # Render the connect time at the boundary; registration stores only
+        # the raw nanosecond reading
+        info['connected_at'] = datetime.fromtimestamp(
+            info.pop('connected_ns') / 1e9).isoformat()
+        return info
 
     def get_active_sessions_count(self) -> int:
         """Get the number of active sessions"""
@@ -248,7 +419,7 @@ class WebSocketService:
             emit('transcription', {
                 'text': transcription,
                 'socket_id': socket_id,
-                'timestamp': datetime.now().isoformat()
+                'timestamp': self._now_iso()
             }, room=socket_id)
 
             logger.info(f"DAY 17: Sent transcription to {socket_id}: {transcription}")
@@ -270,7 +441,7 @@ class WebSocketService:
                 'type': turn_data.get('type', 'turn_end'),
                 'transcript': turn_data.get('transcript', ''),
                 'socket_id': socket_id,
-                'timestamp': turn_data.get('timestamp', datetime.now().isoformat()),
+                'timestamp': turn_data.get('timestamp', self._now_iso()),
                 'confidence': turn_data.get('confidence', 0.0)
             }, room=socket_id)
 
@@ -301,7 +472,7 @@ class WebSocketService:
 
             if success:
                 self.transcription_sessions[socket_id] = {
-                    'started_at': datetime.now().isoformat(),
+                    'started_at': self._now_iso(),
                     'callback': lambda text: self._on_transcription_received(socket_id, text),
                     'turn_callback': lambda turn_data: self._on_turn_detected(socket_id, turn_data)
                 }
@@ -350,7 +521,7 @@ class WebSocketService:
                     'message': 'LLM service not configured. Please set GEMINI_API_KEY.',
                     'transcript': transcript,
                     'socket_id': socket_id,
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': self._now_iso()
                 }, room=socket_id)
                 return
 
@@ -374,7 +545,7 @@ class WebSocketService:
                     'chunk_number': chunk_counter,
                     'transcript': transcript,
                     'socket_id': socket_id,
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': self._now_iso()
                 }, room=socket_id)
 
             session_messages = []
@@ -403,7 +574,7 @@ class WebSocketService:
                     'character_count': len(final_response),
                     'model_used': 'gemini-2.0-flash-exp',
                     'session_id': socket_id,
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': self._now_iso()
                 }, room=socket_id)
 
                 # DAY 20 & 21: Process with Murf WebSocket if session is active
@@ -429,7 +600,7 @@ class WebSocketService:
                     'fallback_response': result.get('fallback_response'),
                     'transcript': transcript,
                     'socket_id': socket_id,
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': self._now_iso()
                 }, room=socket_id)
 
         except Exception as e:
@@ -440,7 +611,7 @@ class WebSocketService:
                 'error': f'Streaming LLM processing error: {str(e)}',
                 'transcript': transcript,
                 'socket_id': socket_id,
-                'timestamp': datetime.now().isoformat()
+                'timestamp': self._now_iso()
             }, room=socket_id)
 
     async def start_murf_websocket(self, socket_id: str) -> Dict[str, Any]:
@@ -540,7 +711,7 @@ class WebSocketService:
                     'base64_audio': audio_base64,
                     'text': text,
                     'audio_length': len(audio_base64),
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': self._now_iso()
                 }
             else:
                 return {
@@ -582,7 +753,7 @@ class WebSocketService:
                     'chunk_size': len(chunk),
                     'total_chunks': len(chunks),
                     'original_text': original_text,
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': self._now_iso()
                 }
 
                 # Emit chunk to specific client
@@ -605,7 +776,7 @@ class WebSocketService:
                 'total_chunks': len(chunks),
                 'total_size': total_size,
                 'original_text': original_text,
-                'completion_timestamp': datetime.now().isoformat()
+                'completion_timestamp': self._now_iso()
             }
 
             if hasattr(self, 'socketio') and self.socketio:
@@ -628,7 +799,7 @@ class WebSocketService:
             if hasattr(self, 'socketio') and self.socketio:
                 await self.socketio.emit(
                     'audio_stream_error',
-                    {'error': str(e), 'timestamp': datetime.now().isoformat()},
+                    {'error': str(e), 'timestamp': self._now_iso()},
                     room=socket_id
                 )
 
@@ -657,10 +828,12 @@ class WebSocketService:
 
             logger.info(f"Received streaming audio from {socket_id}")
 
+            audio_size = self._payload_size(audio_data)
+
             print(f"\nDAY 17: STREAMING AUDIO RECEIVED")
             print(f"Socket ID: {socket_id}")
             print(f"Session ID: {session_id}")
-            print(f"Audio Size: {len(audio_data) if audio_data else 0} bytes")
+            print(f"Audio Size: {audio_size} bytes")
             print(f"Time: {datetime.now().strftime('%H:%M:%S')}")
 
             self._save_audio_chunk(session_id, socket_id, audio_data)
@@ -669,8 +842,8 @@ class WebSocketService:
                 'status': 'received',
                 'socket_id': socket_id,
                 'session_id': session_id,
-                'timestamp': datetime.now().isoformat(),
-                'audio_size': len(audio_data) if audio_data else 0
+                'timestamp': self._now_iso(),
+                'audio_size': audio_size
             }
 
             return response